@@ -28,6 +28,9 @@ class AlertingSystem:
         self.alert_queue = []
         self.queue_lock = threading.Lock()
         self.running = False
+        # Called with False/True when alert processing fails or recovers
+        self._health_listener = None
+        self._healthy = True
         self.init_alerting_database()
     
     def setup_logging(self):
@@ -209,6 +212,17 @@ class AlertingSystem:
         self.running = False
         self.logger.info("Alert processor stopped")
     
+    def set_health_listener(self, listener):
+        """Register a callback for alert processing failures and recoveries"""
+        self._health_listener = listener
+    
+    def _set_healthy(self, healthy):
+        """Report a health change to the listener, if there is one"""
+        if healthy != self._healthy:
+            self._healthy = healthy
+            if self._health_listener:
+                self._health_listener(healthy)
+    
     def _process_alerts(self):
         """Process alerts from queue"""
         while self.running:
@@ -217,11 +231,13 @@ class AlertingSystem:
                     if self.alert_queue:
                         alert = self.alert_queue.pop(0)
                         self._send_alert(alert)
+                self._set_healthy(True)
                 
                 time.sleep(1)  # Check queue every second
                 
             except Exception as e:
                 self.logger.error("Alert processing error: %s", e)
+                self._set_healthy(False)
     
     def create_alert(self, alert_id, severity, title, message, metadata=None):
         """Create new alert"""
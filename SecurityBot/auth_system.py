@@ -122,7 +122,7 @@ class AuthenticationSystem:
     
     def hash_password(self, password, salt):
         """Hash password with salt"""
-        return hashlib.pbkdf2_hex(password.encode(), salt.encode(), 100000, 64)
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000, 64).hex()
     
     def verify_password(self, password, password_hash, salt):
         """Verify password against hash"""
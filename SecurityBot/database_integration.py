@@ -14,11 +14,46 @@ import csv
 import os
 
 
+# Old rows are deleted this many at a time, one commit per batch, so the WAL
+# and the write lock stay small however much data has expired
+CLEANUP_BATCH_SIZE = 10000
+# Free pages handed back to the filesystem after each cleanup
+CLEANUP_VACUUM_PAGES = 1000
+
+# Bytes per connection as a generated column, summed by the network reports.
+# STORED computes it once on insert instead of on every report read.
+# Generated columns need SQLite 3.31; older libraries create the table
+# without it and the reports add the two columns per row instead.
+if sqlite3.sqlite_version_info >= (3, 31, 0):
+    NETWORK_TOTAL_BYTES_COLUMN = """,
+                    total_bytes INTEGER
+                        GENERATED ALWAYS AS (bytes_sent + bytes_received) STORED"""
+else:
+    NETWORK_TOTAL_BYTES_COLUMN = ""
+
+# Pager sizes for each pooled connection. Every connection in the pool keeps
+# its own page cache and mapping, so these are per connection: up to
+# max_connections times this much in total.
+POOL_CACHE_SIZE_KIB = 8192
+POOL_MMAP_SIZE = 32 * 1024 * 1024
+
+# Time-series tables pruned by cleanup_old_data and their timestamp columns
+CLEANUP_TABLES = (
+    ('network_activity', 'recorded_at'),
+    ('process_activity', 'recorded_at'),
+    ('system_metrics', 'recorded_at'),
+    ('file_integrity', 'monitored_at'),
+)
+
+
 class DatabaseIntegration:
     """Enterprise database integration with analytics"""
     
-    def __init__(self, db_path="security_bot.db"):
+    def __init__(self, db_path="security_bot.db", cache_size_kib=POOL_CACHE_SIZE_KIB,
+                 mmap_size=POOL_MMAP_SIZE):
         self.db_path = db_path
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
         self.connection_pool = []
         self.pool_lock = threading.Lock()
         self.max_connections = 10
@@ -42,6 +77,16 @@ class DatabaseIntegration:
                     timeout=30.0
                 )
                 conn.row_factory = sqlite3.Row
+                # Incremental auto-vacuum only takes hold on a new database,
+                # so it is requested before WAL mode writes the header
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                # WAL lets readers run while a writer commits; the rest
+                # tunes the pager for this connection
+                conn.execute("PRAGMA journal_mode=WAL").fetchone()
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+                conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}").fetchone()
+                conn.execute("PRAGMA temp_store=MEMORY")
                 return conn
     
     def return_connection(self, conn):
@@ -89,9 +134,9 @@ class DatabaseIntegration:
                     bytes_received INTEGER DEFAULT 0,
                     connection_duration REAL,
                     flags TEXT,
-                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP{}
                 )
-            """)
+            """.format(NETWORK_TOTAL_BYTES_COLUMN))
             
             # File integrity monitoring
             cursor.execute("""
@@ -189,6 +234,11 @@ class DatabaseIntegration:
                 "CREATE INDEX IF NOT EXISTS idx_threats_severity ON threats(severity)",
                 "CREATE INDEX IF NOT EXISTS idx_threats_type ON threats(threat_type)",
                 "CREATE INDEX IF NOT EXISTS idx_threats_status ON threats(status)",
+                # GET /threats order: threats without detected_at sort as ''
+                "CREATE INDEX IF NOT EXISTS idx_threats_listing_key ON threats"
+                "(severity, status, COALESCE(detected_at, ''), threat_id)",
+                "CREATE INDEX IF NOT EXISTS idx_threats_sort_key ON threats"
+                "(COALESCE(detected_at, ''), threat_id)",
                 "CREATE INDEX IF NOT EXISTS idx_network_source_ip ON network_activity(source_ip)",
                 "CREATE INDEX IF NOT EXISTS idx_network_recorded_at ON network_activity(recorded_at)",
                 "CREATE INDEX IF NOT EXISTS idx_file_path ON file_integrity(file_path)",
@@ -201,6 +251,19 @@ class DatabaseIntegration:
                 "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action)"
             ]
             
+            # Indexing the generated column next to recorded_at lets report
+            # windows sum the byte counts without reading the table rows.
+            # Databases created before the column existed go without.
+            if self.has_column('network_activity', 'total_bytes', cursor):
+                indexes.append(
+                    "CREATE INDEX IF NOT EXISTS idx_network_recorded_bytes "
+                    "ON network_activity(recorded_at, total_bytes)"
+                )
+            
+            # Replaced by the COALESCE listing indexes above
+            for index_name in ('idx_threats_listing', 'idx_threats_detected_id'):
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            
             for index_sql in indexes:
                 cursor.execute(index_sql)
             
@@ -214,6 +277,13 @@ class DatabaseIntegration:
             if 'conn' in locals():
                 self.return_connection(conn)
     
+    @staticmethod
+    def has_column(table_name, column_name, cursor):
+        """Whether a table has a column, generated columns included"""
+        # table_xinfo, unlike table_info, lists generated columns
+        cursor.execute(f"PRAGMA table_xinfo({table_name})")
+        return any(row[1] == column_name for row in cursor.fetchall())
+    
     def log_threat(self, threat_data):
         """Log security threat to database"""
         try:
@@ -398,6 +468,9 @@ class DatabaseIntegration:
     
     def get_threat_statistics(self, days=30):
         """Get threat statistics"""
+        # Bound as a parameter so each query's prepared statement is reused
+        # from the connection's statement cache whatever the window
+        since = f'-{int(days)} days'
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -406,9 +479,9 @@ class DatabaseIntegration:
             cursor.execute("""
                 SELECT severity, COUNT(*) as count
                 FROM threats 
-                WHERE detected_at >= datetime('now', '-{} days')
+                WHERE detected_at >= datetime('now', ?)
                 GROUP BY severity
-            """.format(days))
+            """, (since,))
             
             severity_stats = dict(cursor.fetchall())
             
@@ -416,10 +489,10 @@ class DatabaseIntegration:
             cursor.execute("""
                 SELECT date(detected_at) as day, COUNT(*) as count
                 FROM threats 
-                WHERE detected_at >= datetime('now', '-{} days')
+                WHERE detected_at >= datetime('now', ?)
                 GROUP BY date(detected_at)
                 ORDER BY day
-            """.format(days))
+            """, (since,))
             
             daily_trends = cursor.fetchall()
             
@@ -427,11 +500,11 @@ class DatabaseIntegration:
             cursor.execute("""
                 SELECT threat_type, COUNT(*) as count
                 FROM threats 
-                WHERE detected_at >= datetime('now', '-{} days')
+                WHERE detected_at >= datetime('now', ?)
                 GROUP BY threat_type
                 ORDER BY count DESC
                 LIMIT 10
-            """.format(days))
+            """, (since,))
             
             top_types = cursor.fetchall()
             
@@ -451,6 +524,7 @@ class DatabaseIntegration:
     
     def get_network_statistics(self, hours=24):
         """Get network activity statistics"""
+        since = f'-{int(hours)} hours'
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -460,11 +534,11 @@ class DatabaseIntegration:
                 SELECT source_ip, COUNT(*) as connections,
                        SUM(bytes_sent + bytes_received) as total_bytes
                 FROM network_activity 
-                WHERE recorded_at >= datetime('now', '-{} hours')
+                WHERE recorded_at >= datetime('now', ?)
                 GROUP BY source_ip
                 ORDER BY connections DESC
                 LIMIT 10
-            """.format(hours))
+            """, (since,))
             
             top_sources = cursor.fetchall()
             
@@ -472,9 +546,9 @@ class DatabaseIntegration:
             cursor.execute("""
                 SELECT protocol, COUNT(*) as count
                 FROM network_activity 
-                WHERE recorded_at >= datetime('now', '-{} hours')
+                WHERE recorded_at >= datetime('now', ?)
                 GROUP BY protocol
-            """.format(hours))
+            """, (since,))
             
             protocol_stats = cursor.fetchall()
             
@@ -482,10 +556,10 @@ class DatabaseIntegration:
             cursor.execute("""
                 SELECT strftime('%H', recorded_at) as hour, COUNT(*) as count
                 FROM network_activity 
-                WHERE recorded_at >= datetime('now', '-{} hours')
+                WHERE recorded_at >= datetime('now', ?)
                 GROUP BY strftime('%H', recorded_at)
                 ORDER BY hour
-            """.format(hours))
+            """, (since,))
             
             hourly_activity = cursor.fetchall()
             
@@ -503,40 +577,55 @@ class DatabaseIntegration:
                 self.return_connection(conn)
             return {}
     
+    def get_stored_columns(self, table_name):
+        """A table's stored columns in order, leaving out generated ones"""
+        conn = self.get_connection()
+        try:
+            # table_info skips generated columns, so exports keep the stored
+            # data only, as SELECT * did before total_bytes was added
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+        finally:
+            self.return_connection(conn)
+    
+    def build_export_query(self, table_name, date_from=None, date_to=None):
+        """Build the SELECT and parameters exporting a table, optionally by date"""
+        # Build query with optional date filtering
+        query = f"SELECT {', '.join(self.get_stored_columns(table_name))} FROM {table_name}"
+        params = []
+        
+        if date_from or date_to:
+            # Assume tables have a timestamp column
+            timestamp_columns = {
+                'threats': 'detected_at',
+                'network_activity': 'recorded_at',
+                'file_integrity': 'monitored_at',
+                'process_activity': 'recorded_at',
+                'system_metrics': 'recorded_at',
+                'audit_log': 'timestamp'
+            }
+            
+            timestamp_col = timestamp_columns.get(table_name)
+            if timestamp_col:
+                conditions = []
+                if date_from:
+                    conditions.append(f"{timestamp_col} >= ?")
+                    params.append(date_from)
+                if date_to:
+                    conditions.append(f"{timestamp_col} <= ?")
+                    params.append(date_to)
+                
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+        
+        return query, params
+    
     def export_data(self, table_name, output_file, date_from=None, date_to=None):
         """Export table data to CSV"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Build query with optional date filtering
-            query = f"SELECT * FROM {table_name}"
-            params = []
-            
-            if date_from or date_to:
-                # Assume tables have a timestamp column
-                timestamp_columns = {
-                    'threats': 'detected_at',
-                    'network_activity': 'recorded_at',
-                    'file_integrity': 'monitored_at',
-                    'process_activity': 'recorded_at',
-                    'system_metrics': 'recorded_at',
-                    'audit_log': 'timestamp'
-                }
-                
-                timestamp_col = timestamp_columns.get(table_name)
-                if timestamp_col:
-                    conditions = []
-                    if date_from:
-                        conditions.append(f"{timestamp_col} >= ?")
-                        params.append(date_from)
-                    if date_to:
-                        conditions.append(f"{timestamp_col} <= ?")
-                        params.append(date_to)
-                    
-                    if conditions:
-                        query += " WHERE " + " AND ".join(conditions)
-            
+            query, params = self.build_export_query(table_name, date_from, date_to)
             cursor.execute(query, params)
             
             # Get column names
@@ -567,25 +656,35 @@ class DatabaseIntegration:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
-            
-            # Clean up old records
-            cleanup_queries = [
-                f"DELETE FROM network_activity WHERE recorded_at < '{cutoff_date}'",
-                f"DELETE FROM process_activity WHERE recorded_at < '{cutoff_date}'",
-                f"DELETE FROM system_metrics WHERE recorded_at < '{cutoff_date}'",
-                f"DELETE FROM file_integrity WHERE monitored_at < '{cutoff_date}'"
-            ]
+            # Same format and clock as the CURRENT_TIMESTAMP column defaults
+            cursor.execute("SELECT datetime('now', ?)", (f'-{int(days_to_keep)} days',))
+            cutoff_date = cursor.fetchone()[0]
             
+            # Clean up old records in bounded batches
             total_deleted = 0
-            for query in cleanup_queries:
-                cursor.execute(query)
-                total_deleted += cursor.rowcount
-            
-            # Vacuum database to reclaim space
-            cursor.execute("VACUUM")
+            for table, column in CLEANUP_TABLES:
+                query = f"""
+                    DELETE FROM {table} WHERE rowid IN (
+                        SELECT rowid FROM {table} WHERE {column} < ? LIMIT ?
+                    )
+                """
+                while True:
+                    cursor.execute(query, (cutoff_date, CLEANUP_BATCH_SIZE))
+                    conn.commit()
+                    total_deleted += cursor.rowcount
+                    if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                        break
+            
+            # Reclaim space: incrementally once the database uses incremental
+            # auto-vacuum, otherwise with a one-off VACUUM that converts it
+            if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                # executescript steps the pragma to completion; execute would
+                # stop after the first page
+                cursor.executescript(f"PRAGMA incremental_vacuum({CLEANUP_VACUUM_PAGES})")
+            elif total_deleted:
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                cursor.execute("VACUUM")
             
-            conn.commit()
             self.return_connection(conn)
             
             self.logger.info("Cleaned up %d old records", total_deleted)
@@ -594,6 +693,7 @@ class DatabaseIntegration:
         except Exception as e:
             self.logger.error("Failed to cleanup old data: %s", e)
             if 'conn' in locals():
+                conn.rollback()
                 self.return_connection(conn)
             return 0
     
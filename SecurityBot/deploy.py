@@ -14,6 +14,8 @@ import zipfile
 import requests
 from datetime import datetime
 import logging
+import logging.handlers
+import queue
 
 
 class SecurityBotDeployer:
@@ -23,23 +25,50 @@ class SecurityBotDeployer:
         self.deployment_dir = Path(__file__).parent
         self.install_dir = Path("C:/Program Files/SecurityBot Enterprise")
         self.service_name = "SecurityBotEnterprise"
+        self.log_listener = None
+        self.log_handler = None
         self.setup_logging()
         
     def setup_logging(self):
-        """Setup deployment logging"""
+        """Setup deployment logging
+        
+        Records are handed to a QueueHandler so deployment steps never block on
+        disk or console I/O; a QueueListener drains them on a background thread.
+        """
         log_dir = self.deployment_dir / "deployment_logs"
         log_dir.mkdir(exist_ok=True)
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / f"deployment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
-                logging.StreamHandler()
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_dir / f"deployment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue(-1)
+        self.log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
         )
+        self.log_listener.start()
+        
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        self.log_handler = logging.handlers.QueueHandler(log_queue)
+        root_logger.addHandler(self.log_handler)
         self.logger = logging.getLogger('SecurityBotDeployer')
     
+    def stop_logging(self):
+        """Flush queued log records and stop the background listener
+        
+        The QueueHandler is detached from the root logger first so later
+        records are not left in a queue that nothing drains.
+        """
+        if self.log_handler is not None:
+            logging.getLogger().removeHandler(self.log_handler)
+            self.log_handler = None
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
+    
     def check_prerequisites(self):
         """Check system prerequisites for deployment"""
         self.logger.info("Checking system prerequisites...")
@@ -145,20 +174,14 @@ class SecurityBotDeployer:
         """Create required directory structure"""
         self.logger.info("Creating directory structure...")
         
-        directories = [
-            self.install_dir,
-            self.install_dir / "logs",
-            self.install_dir / "data",
-            self.install_dir / "reports",
-            self.install_dir / "config",
-            self.install_dir / "static",
-            self.install_dir / "templates",
-            self.install_dir / "backups"
-        ]
+        subdirectories = ("logs", "data", "reports", "config", "static", "templates", "backups")
         
         try:
-            for directory in directories:
-                directory.mkdir(parents=True, exist_ok=True)
+            # Resolve the ancestor chain once; the leaves only need a single mkdir each
+            self.install_dir.mkdir(parents=True, exist_ok=True)
+            for name in subdirectories:
+                directory = self.install_dir / name
+                directory.mkdir(exist_ok=True)
                 self.logger.debug("Created directory: %s", directory)
             
             self.logger.info("✅ Directory structure created successfully")
@@ -378,22 +401,42 @@ pause
         
         try:
             import winshell
-            from win32com.client import Dispatch
+            import pythoncom
+            from win32com.shell import shell
             
             desktop = winshell.desktop()
+            startup_batch = str(self.install_dir / "start_security_bot.bat")
+            
+            # (link file, target, working directory, icon)
+            shortcut_specs = [
+                (os.path.join(desktop, 'Security Bot Enterprise.lnk'),
+                 startup_batch, str(self.install_dir), startup_batch),
+            ]
+            
+            # Build every link through the native IShellLink interface first,
+            # then persist them back-to-back so the .lnk writes are not interleaved
+            # with COM scripting round-trips
+            pending_links = []
+            for link_path, target, working_dir, icon in shortcut_specs:
+                link = pythoncom.CoCreateInstance(
+                    shell.CLSID_ShellLink, None,
+                    pythoncom.CLSCTX_INPROC_SERVER, shell.IID_IShellLink
+                )
+                link.SetPath(target)
+                if working_dir:
+                    link.SetWorkingDirectory(working_dir)
+                if icon:
+                    link.SetIconLocation(icon, 0)
+                pending_links.append((link.QueryInterface(pythoncom.IID_IPersistFile), link_path))
             
-            # Main application shortcut
-            shell = Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortCut(os.path.join(desktop, 'Security Bot Enterprise.lnk'))
-            shortcut.Targetpath = str(self.install_dir / "start_security_bot.bat")
-            shortcut.WorkingDirectory = str(self.install_dir)
-            shortcut.IconLocation = str(self.install_dir / "start_security_bot.bat")
-            shortcut.save()
+            for persist_file, link_path in pending_links:
+                persist_file.Save(link_path, 0)
             
-            # Dashboard shortcut
-            dashboard_shortcut = shell.CreateShortCut(os.path.join(desktop, 'Security Bot Dashboard.lnk'))
-            dashboard_shortcut.Targetpath = "http://localhost:8080"
-            dashboard_shortcut.save()
+            # IShellLink targets must be filesystem paths, so the dashboard
+            # gets an internet shortcut instead
+            dashboard_link = Path(desktop) / 'Security Bot Dashboard.url'
+            dashboard_link.write_text("[InternetShortcut]\nURL=http://localhost:8080\n",
+                                      encoding='utf-8')
             
             self.logger.info("✅ Desktop shortcuts created")
             return True
@@ -492,60 +535,63 @@ pause
     
     def deploy(self):
         """Execute complete deployment process"""
-        self.logger.info("Starting Security Bot Enterprise deployment...")
-        
-        deployment_steps = [
-            ("Checking prerequisites", self.check_prerequisites),
-            ("Creating directory structure", self.create_directory_structure),
-            ("Deploying application files", self.deploy_application_files),
-            ("Configuring Windows startup", self.configure_windows_startup),
-            ("Creating desktop shortcuts", self.create_desktop_shortcuts),
-            ("Configuring firewall", self.configure_firewall),
-            ("Running post-deployment tests", self.run_post_deployment_tests)
-        ]
+        try:
+            self.logger.info("Starting Security Bot Enterprise deployment...")
+        
+            deployment_steps = [
+                ("Checking prerequisites", self.check_prerequisites),
+                ("Creating directory structure", self.create_directory_structure),
+                ("Deploying application files", self.deploy_application_files),
+                ("Configuring Windows startup", self.configure_windows_startup),
+                ("Creating desktop shortcuts", self.create_desktop_shortcuts),
+                ("Configuring firewall", self.configure_firewall),
+                ("Running post-deployment tests", self.run_post_deployment_tests)
+            ]
         
-        success_count = 0
-        total_steps = len(deployment_steps)
+            success_count = 0
+            total_steps = len(deployment_steps)
         
-        for step_name, step_function in deployment_steps:
-            self.logger.info("Step: %s", step_name)
-            try:
-                if callable(step_function):
-                    if step_name == "Checking prerequisites":
-                        result = step_function()
-                        if all(result.values()):
-                            success_count += 1
+            for step_name, step_function in deployment_steps:
+                self.logger.info("Step: %s", step_name)
+                try:
+                    if callable(step_function):
+                        if step_name == "Checking prerequisites":
+                            result = step_function()
+                            if all(result.values()):
+                                success_count += 1
+                            else:
+                                self.logger.error("Prerequisites not met: %s", 
+                                                [k for k, v in result.items() if not v])
                         else:
-                            self.logger.error("Prerequisites not met: %s", 
-                                            [k for k, v in result.items() if not v])
+                            if step_function():
+                                success_count += 1
                     else:
-                        if step_function():
-                            success_count += 1
-                else:
-                    success_count += 1
+                        success_count += 1
                     
-            except Exception as e:
-                self.logger.error("Step failed: %s - %s", step_name, e)
-        
-        # Deployment summary
-        self.logger.info("="*60)
-        if success_count == total_steps:
-            self.logger.info("🎉 DEPLOYMENT SUCCESSFUL!")
-            self.logger.info("Security Bot Enterprise has been deployed successfully.")
-            self.logger.info("Installation directory: %s", self.install_dir)
-            self.logger.info("To start the system:")
-            self.logger.info("  1. Run: %s", self.install_dir / "start_security_bot.bat")
-            self.logger.info("  2. Or access via desktop shortcut")
-            self.logger.info("  3. Dashboard will be available at: http://localhost:8080")
-            self.logger.info("  4. REST API will be available at: http://localhost:8081")
-        else:
-            self.logger.error("⚠️  DEPLOYMENT PARTIALLY SUCCESSFUL")
-            self.logger.error("Completed: %d/%d steps", success_count, total_steps)
-            self.logger.error("Please check the logs and resolve any issues.")
+                except Exception as e:
+                    self.logger.error("Step failed: %s - %s", step_name, e)
+        
+            # Deployment summary
+            self.logger.info("="*60)
+            if success_count == total_steps:
+                self.logger.info("🎉 DEPLOYMENT SUCCESSFUL!")
+                self.logger.info("Security Bot Enterprise has been deployed successfully.")
+                self.logger.info("Installation directory: %s", self.install_dir)
+                self.logger.info("To start the system:")
+                self.logger.info("  1. Run: %s", self.install_dir / "start_security_bot.bat")
+                self.logger.info("  2. Or access via desktop shortcut")
+                self.logger.info("  3. Dashboard will be available at: http://localhost:8080")
+                self.logger.info("  4. REST API will be available at: http://localhost:8081")
+            else:
+                self.logger.error("⚠️  DEPLOYMENT PARTIALLY SUCCESSFUL")
+                self.logger.error("Completed: %d/%d steps", success_count, total_steps)
+                self.logger.error("Please check the logs and resolve any issues.")
         
-        self.logger.info("="*60)
+            self.logger.info("="*60)
         
-        return success_count == total_steps
+            return success_count == total_steps
+        finally:
+            self.stop_logging()
 
 
 def main():
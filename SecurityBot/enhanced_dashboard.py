@@ -4,14 +4,159 @@ Real-time security monitoring dashboard with Chart.js visualizations
 """
 
 import os
+import gzip
+import hashlib
 import json
+import socket
 import sqlite3
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import logging
+from contextlib import suppress
+
+# orjson encodes straight to bytes and is much faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def encode_json(data):
+    """Serialize data to compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+# Seconds a dashboard snapshot is reused before the database is queried again;
+# half the browser refresh interval so each 30s poll sees fresh data
+CACHE_TTL = 15
+
+# Length of the dashboard's "recent activity" window
+WINDOW_SECONDS = 24 * 3600
+
+
+def window_cutoff():
+    """Return the start of the dashboard window in the threats.detected_at format
+    
+    detected_at defaults to CURRENT_TIMESTAMP (UTC, 'YYYY-MM-DD HH:MM:SS'), so a
+    bound string of the same shape compares correctly and lets SQLite range-scan
+    idx_threats_detected_at.
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() - WINDOW_SECONDS))
+
+
+# Per-hour, per-severity threat counts maintained by triggers on threats, so the
+# dashboard aggregates read at most 24 x 4 rows whatever the size of threats.
+# hour_bucket is 'YYYY-MM-DD HH' in the same UTC clock as detected_at.
+# The whole script is one IMMEDIATE transaction, so no threat is written
+# between creating the triggers and backfilling. Counts kept before the delete
+# and update triggers existed may include removed threats and are rebuilt.
+ROLLUP_DDL = """
+    BEGIN IMMEDIATE;
+    CREATE INDEX IF NOT EXISTS idx_threats_detected_at ON threats(detected_at);
+    CREATE TABLE IF NOT EXISTS threats_hourly (
+        hour_bucket TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (hour_bucket, severity)
+    );
+    DELETE FROM threats_hourly
+    WHERE NOT EXISTS (SELECT 1 FROM sqlite_master
+                      WHERE type = 'trigger' AND name = 'trg_threats_hourly_delete');
+    CREATE TRIGGER IF NOT EXISTS trg_threats_hourly AFTER INSERT ON threats
+    WHEN NEW.detected_at IS NOT NULL AND NEW.severity IS NOT NULL
+    BEGIN
+        INSERT INTO threats_hourly (hour_bucket, severity, count)
+        VALUES (strftime('%Y-%m-%d %H', NEW.detected_at), NEW.severity, 1)
+        ON CONFLICT (hour_bucket, severity) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_threats_hourly_delete AFTER DELETE ON threats
+    WHEN OLD.detected_at IS NOT NULL AND OLD.severity IS NOT NULL
+    BEGIN
+        UPDATE threats_hourly SET count = count - 1
+        WHERE hour_bucket = strftime('%Y-%m-%d %H', OLD.detected_at) AND severity = OLD.severity;
+        DELETE FROM threats_hourly
+        WHERE hour_bucket = strftime('%Y-%m-%d %H', OLD.detected_at) AND severity = OLD.severity
+          AND count <= 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_threats_hourly_update
+    AFTER UPDATE OF severity, detected_at ON threats
+    BEGIN
+        UPDATE threats_hourly SET count = count - 1
+        WHERE OLD.detected_at IS NOT NULL AND OLD.severity IS NOT NULL
+          AND hour_bucket = strftime('%Y-%m-%d %H', OLD.detected_at) AND severity = OLD.severity;
+        DELETE FROM threats_hourly
+        WHERE OLD.detected_at IS NOT NULL AND OLD.severity IS NOT NULL
+          AND hour_bucket = strftime('%Y-%m-%d %H', OLD.detected_at) AND severity = OLD.severity
+          AND count <= 0;
+        INSERT INTO threats_hourly (hour_bucket, severity, count)
+        SELECT strftime('%Y-%m-%d %H', NEW.detected_at), NEW.severity, 1
+        WHERE NEW.detected_at IS NOT NULL AND NEW.severity IS NOT NULL
+        ON CONFLICT (hour_bucket, severity) DO UPDATE SET count = count + 1;
+    END;
+    INSERT INTO threats_hourly (hour_bucket, severity, count)
+    SELECT strftime('%Y-%m-%d %H', detected_at), severity, COUNT(*)
+    FROM threats
+    WHERE detected_at IS NOT NULL AND severity IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM threats_hourly)
+    GROUP BY 1, 2;
+    COMMIT;
+"""
+
+# Dashboard queries are constant text with bound parameters, so the persistent
+# connection's statement cache compiles each of them only once.
+# Severity x hour-of-day counts from the roll-up, with per-severity and overall
+# totals computed by window functions. The roll-up only has whole hours, so the
+# oldest, partial hour of the window is counted from threats instead; the
+# bounded range keeps that to an index scan of at most one hour of rows.
+ROLLUP_COUNTS_SQL = """
+    WITH counts (severity, hour, n) AS (
+        SELECT severity, substr(hour_bucket, 12, 2), count
+        FROM threats_hourly
+        WHERE hour_bucket > substr(:cutoff, 1, 13)
+        UNION ALL
+        SELECT severity, strftime('%H', detected_at), 1
+        FROM threats
+        WHERE detected_at >= :cutoff
+          AND detected_at < strftime('%Y-%m-%d %H:00:00', :cutoff, '+1 hour')
+          AND severity IS NOT NULL
+    )
+    SELECT severity, hour, SUM(n),
+           SUM(SUM(n)) OVER (PARTITION BY severity),
+           SUM(SUM(n)) OVER ()
+    FROM counts
+    GROUP BY severity, hour
+"""
+
+# The same counts scanned from threats, used until the roll-up exists
+WINDOW_COUNTS_SQL = """
+    SELECT severity, strftime('%H', detected_at) as hour, COUNT(*),
+           SUM(COUNT(*)) OVER (PARTITION BY severity),
+           SUM(COUNT(*)) OVER ()
+    FROM threats
+    WHERE detected_at >= ?
+    GROUP BY severity, hour
+"""
+
+RECENT_THREATS_SQL = """
+    SELECT threat_type, severity, detected_at, description
+    FROM threats
+    ORDER BY detected_at DESC
+    LIMIT ?
+"""
+
+# Number of rows in the recent threats list
+RECENT_THREATS_LIMIT = 10
+
+# Seconds between comment lines on an idle event stream, so dead clients are
+# noticed and proxies do not time the stream out
+STREAM_KEEPALIVE = 20
 
 
 class EnhancedDashboard:
@@ -22,12 +167,65 @@ class EnhancedDashboard:
         self.db_path = db_path
         self.server = None
         self.running = False
+        # (data, JSON bytes, gzipped JSON bytes) for the current snapshot
+        self._cache = None
+        self._cache_ts = 0.0
+        self._cache_lock = threading.Lock()
+        # All queries run on this single worker, so a slow read never holds up
+        # a request thread and the shared connection is used by one thread
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='DashboardDB')
+        self._refresh_future = None
+        self._rollup_ready = False
+        self._db_conn = None
+        # Latest encoded snapshot pushed to /api/stream subscribers; _event_seq
+        # counts publications so each subscriber can tell when it has a new one
+        self._updates = threading.Condition()
+        self._event_payload = None
+        self._event_seq = 0
+        self._stop_event = threading.Event()
+        # Called with False/True when the server or data queries fail or recover
+        self._health_listener = None
+        self._healthy = True
+        # The page is static, so encode (and compress) it once up front
+        self._html_bytes = DashboardRequestHandler.get_dashboard_html().encode('utf-8')
+        self._html_gz = gzip.compress(self._html_bytes, 6)
         self.setup_logging()
+        self._init_db()
         
     def setup_logging(self):
         """Setup dashboard logging"""
         self.logger = logging.getLogger('Dashboard')
     
+    def _init_db(self):
+        """One-time database setup, done once the threats table exists
+        
+        Switches the database to WAL so dashboard reads never block the
+        detection engine's writes, makes sure the window filter has an index
+        (databases created by ThreatDetectionEngine have none), creates and
+        backfills the threats_hourly roll-up and refreshes planner statistics.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                               "AND name = 'threats'")
+                if cursor.fetchone() is None:
+                    return
+                
+                # journal_mode is persistent and cannot change inside a transaction
+                cursor.execute("PRAGMA journal_mode=WAL").fetchone()
+                # The backfill only fills an empty threats_hourly, decided
+                # inside the same transaction
+                cursor.executescript(ROLLUP_DDL)
+                self._rollup_ready = True
+                # Only re-analyzes tables whose statistics are stale
+                cursor.execute("PRAGMA optimize")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning("Dashboard database setup failed, scanning threats directly: %s", e)
+    
     def start_server(self):
         """Start dashboard web server"""
         try:
@@ -37,78 +235,234 @@ class EnhancedDashboard:
             handler = DashboardRequestHandler
             handler.dashboard = self
             
-            self.server = HTTPServer(('127.0.0.1', self.port), handler)
+            self.server = DashboardHTTPServer(('127.0.0.1', self.port), handler)
+            
+            self._stop_event.clear()
+            threading.Thread(target=self._publish_updates, name='DashboardPublisher',
+                             daemon=True).start()
             self.server.serve_forever()
             
         except Exception as e:
             self.logger.error("Dashboard server error: %s", e)
+            self._set_healthy(False)
     
     def stop_server(self):
         """Stop dashboard server"""
         if self.server:
             self.running = False
+            self._stop_event.set()
+            # Wake stream subscribers so their handler threads exit
+            with self._updates:
+                self._updates.notify_all()
             self.server.shutdown()
+            # Close on the worker so it cannot race a refresh in progress
+            self._db_executor.submit(self._close_conn).result()
             self.logger.info("Dashboard server stopped")
     
+    def _conn(self):
+        """Return the dashboard's database connection, opening it on first use
+        
+        Only used from the _db_executor worker, so one long-lived connection
+        is safe and keeps its page cache warm between refreshes.
+        """
+        if self._db_conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            # Per-connection settings; WAL itself is set once by _init_db
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8192")
+            self._db_conn = conn
+        return self._db_conn
+    
+    def _close_conn(self):
+        """Close the dashboard's database connection"""
+        if self._db_conn is not None:
+            self._db_conn.close()
+            self._db_conn = None
+    
+    def set_health_listener(self, listener):
+        """Register a callback for dashboard failures and recoveries"""
+        self._health_listener = listener
+    
+    def _set_healthy(self, healthy):
+        """Report a health change to the listener, if there is one"""
+        if healthy != self._healthy:
+            self._healthy = healthy
+            if self._health_listener:
+                self._health_listener(healthy)
+    
+    def _publish_updates(self):
+        """Refresh dashboard data once per CACHE_TTL and push it to all stream subscribers
+        
+        One publisher serves every open dashboard, so the database load does
+        not grow with the number of viewers.
+        """
+        while self.running:
+            try:
+                # Wait for fresh data rather than republishing the stale snapshot
+                payload = self._snapshot(wait=True)[1]
+                with self._updates:
+                    self._event_payload = payload
+                    self._event_seq += 1
+                    self._updates.notify_all()
+            except Exception as e:
+                self.logger.error("Error publishing dashboard update: %s", e)
+            self._stop_event.wait(CACHE_TTL)
+    
+    def wait_for_update(self, last_seq, timeout):
+        """Wait for a snapshot newer than last_seq
+        
+        Returns (seq, payload); payload is None if the wait timed out or the
+        dashboard is stopping.
+        """
+        with self._updates:
+            self._updates.wait_for(
+                lambda: self._event_seq != last_seq or not self.running, timeout)
+            if self._event_seq == last_seq or not self.running:
+                return last_seq, None
+            return self._event_seq, self._event_payload
+    
+    def _refresh(self):
+        """Take a new snapshot; runs on the _db_executor worker
+        
+        The snapshot is encoded and compressed once when it is taken, so every
+        request in the same window just writes out the cached bytes.
+        """
+        data = self._query_dashboard_data()
+        json_data = encode_json(data)
+        self._cache = (data, json_data, gzip.compress(json_data, 5))
+        self._cache_ts = time.monotonic()
+        return self._cache
+    
+    def _schedule_refresh(self):
+        """Start a refresh unless one is already running, and return its future"""
+        with self._cache_lock:
+            if self._refresh_future is None or self._refresh_future.done():
+                self._refresh_future = self._db_executor.submit(self._refresh)
+            return self._refresh_future
+    
+    def _snapshot(self, wait=False):
+        """Return the current snapshot, reusing it for CACHE_TTL seconds
+        
+        Once expired, the old snapshot is still returned while a refresh runs
+        in the background (stale-while-revalidate). Callers only wait for the
+        database when there is no snapshot yet or when wait is set.
+        """
+        cache = self._cache
+        if cache is not None and time.monotonic() - self._cache_ts < CACHE_TTL:
+            return cache
+        
+        future = self._schedule_refresh()
+        if cache is None or wait:
+            return future.result()
+        return cache
+    
     def get_dashboard_data(self):
+        """Get dashboard data, reusing the last snapshot for CACHE_TTL seconds"""
+        return self._snapshot()[0]
+    
+    def get_dashboard_json(self, gzipped=False):
+        """Get dashboard data as JSON bytes, gzip-compressed if requested"""
+        snapshot = self._snapshot()
+        return snapshot[2] if gzipped else snapshot[1]
+    
+    def _query_dashboard_data(self):
         """Get dashboard data from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get threat counts by severity
-            cursor.execute("""
-                SELECT severity, COUNT(*) 
-                FROM threats 
-                WHERE detected_at >= datetime('now', '-24 hours')
-                GROUP BY severity
-            """)
-            severity_data = dict(cursor.fetchall())
+            # The threats table may only appear after the dashboard starts
+            if not self._rollup_ready:
+                self._init_db()
             
-            # Get recent threats
-            cursor.execute("""
-                SELECT threat_type, severity, detected_at, description
-                FROM threats 
-                ORDER BY detected_at DESC 
-                LIMIT 10
-            """)
-            recent_threats = cursor.fetchall()
+            cursor = self._conn().cursor()
             
-            # Get hourly threat distribution
-            cursor.execute("""
-                SELECT strftime('%H', detected_at) as hour, COUNT(*) 
-                FROM threats 
-                WHERE detected_at >= datetime('now', '-24 hours')
-                GROUP BY hour
-                ORDER BY hour
-            """)
-            hourly_data = cursor.fetchall()
+            # Severity and hourly counts come from one pass over the window
+            # (at most 4 severities x 24 hours rows), split up here
+            cutoff = window_cutoff()
+            if self._rollup_ready:
+                cursor.execute(ROLLUP_COUNTS_SQL, {'cutoff': cutoff})
+            else:
+                cursor.execute(WINDOW_COUNTS_SQL, (cutoff,))
+            severity_data = {}
+            total_threats = 0
+            # Dense 24-slot array indexed by hour so the browser can plot it as-is
+            hourly_data = [0] * 24
+            for severity, hour, count, severity_total, total_threats in cursor.fetchall():
+                severity_data[severity] = severity_total
+                hourly_data[int(hour)] += count
             
-            conn.close()
+            # Get recent threats
+            cursor.execute(RECENT_THREATS_SQL, (RECENT_THREATS_LIMIT,))
+            # Format rows for display here, once per refresh, rather than in
+            # every browser on every tick
+            recent_threats = [
+                {
+                    'type_display': (threat_type or 'unknown').replace('_', ' ').upper(),
+                    'severity': severity,
+                    'time_display': '%s UTC' % detected_at if detected_at else '',
+                    'description': description or 'No description available'
+                }
+                for threat_type, severity, detected_at, description
+                in cursor.fetchmany(RECENT_THREATS_LIMIT)
+            ]
             
+            self._set_healthy(True)
             return {
                 'severity_distribution': severity_data,
                 'recent_threats': recent_threats,
                 'hourly_distribution': hourly_data,
-                'total_threats_24h': sum(severity_data.values()),
+                'total_threats_24h': total_threats,
                 'last_updated': datetime.now().isoformat()
             }
             
         except Exception as e:
             self.logger.error("Error getting dashboard data: %s", e)
+            self._set_healthy(False)
+            # Reconnect on the next refresh in case the connection went bad
+            with suppress(sqlite3.Error):
+                self._close_conn()
             return {
                 'severity_distribution': {},
                 'recent_threats': [],
-                'hourly_distribution': [],
+                'hourly_distribution': [0] * 24,
                 'total_threats_24h': 0,
                 'last_updated': datetime.now().isoformat()
             }
 
 
+class DashboardHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server for the dashboard
+    
+    One thread per request so a slow database read or a stalled client does
+    not hold up every other open dashboard.
+    """
+    
+    daemon_threads = True
+    
+    def server_bind(self):
+        """Bind with SO_REUSEPORT where supported so several workers can share the port"""
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
 class DashboardRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for dashboard"""
     
     dashboard = None
+    # Keep connections open between the browser's 30s polls; every response
+    # carries a Content-Length, and idle connections are dropped after the
+    # timeout so they do not pin a server thread forever
+    protocol_version = 'HTTP/1.1'
+    timeout = 60
+    # Responses are small and written in one go; do not let Nagle's algorithm
+    # hold them back waiting for the client's delayed ACK
+    disable_nagle_algorithm = True
+    
+    def end_headers(self):
+        """Advertise the idle timeout so clients do not reuse a dropped connection"""
+        if not self.close_connection:
+            self.send_header('Keep-Alive', 'timeout=%d' % self.timeout)
+        super().end_headers()
     
     def do_GET(self):
         """Handle GET requests"""
@@ -117,6 +471,8 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
                 self.serve_dashboard_html()
             elif self.path == '/api/dashboard-data':
                 self.serve_dashboard_data()
+            elif self.path == '/api/stream':
+                self.serve_event_stream()
             elif self.path.startswith('/static/'):
                 self.serve_static_file()
             else:
@@ -125,38 +481,116 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_error(500, str(e))
     
+    def accepts_gzip(self):
+        """Check whether the client accepts gzip-encoded responses"""
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
     def serve_dashboard_html(self):
         """Serve main dashboard HTML"""
-        html = self.get_dashboard_html()
+        if self.dashboard:
+            gzipped = self.accepts_gzip()
+            body = self.dashboard._html_gz if gzipped else self.dashboard._html_bytes
+        else:
+            gzipped = False
+            body = self.get_dashboard_html().encode('utf-8')
         
         self.send_response(200)
-        self.send_header('Content-Type', 'text/html')
-        self.send_header('Content-Length', len(html.encode()))
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', len(body))
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
         self.end_headers()
-        self.wfile.write(html.encode())
+        self.wfile.write(body)
     
     def serve_dashboard_data(self):
         """Serve dashboard data as JSON"""
         if self.dashboard:
-            data = self.dashboard.get_dashboard_data()
+            gzipped = self.accepts_gzip()
+            json_data = self.dashboard.get_dashboard_json(gzipped)
         else:
-            data = {'error': 'Dashboard not available'}
-        
-        json_data = json.dumps(data).encode()
+            gzipped = False
+            json_data = encode_json({'error': 'Dashboard not available'})
         
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Content-Length', len(json_data))
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        # Let the browser reuse the snapshot while the server-side cache would
+        # return the same data anyway, and revalidate in the background after
+        self.send_header('Cache-Control', 'public, max-age=%d, stale-while-revalidate=30' % CACHE_TTL)
         self.end_headers()
         self.wfile.write(json_data)
     
+    def serve_event_stream(self):
+        """Stream dashboard snapshots as server-sent events until the client leaves"""
+        if not self.dashboard:
+            self.send_error(503, 'Dashboard not available')
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        
+        # Start with the current snapshot, then follow the publisher
+        seq = 0
+        payload = self.dashboard.get_dashboard_json()
+        try:
+            while True:
+                if payload is not None:
+                    self.wfile.write(b'data: ' + payload + b'\n\n')
+                elif not self.dashboard.running:
+                    return
+                else:
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+                seq, payload = self.dashboard.wait_for_update(seq, STREAM_KEEPALIVE)
+        except (BrokenPipeError, ConnectionResetError):
+            # The tab was closed or navigated away
+            pass
+    
     def serve_static_file(self):
         """Serve static files (CSS, JS)"""
-        self.send_error(404)  # Simplified for now
+        asset = STATIC_FILES.get(urllib.parse.urlsplit(self.path).path)
+        if asset is None:
+            self.send_error(404)
+            return
+        body, body_gz, etag, content_type = asset
+        
+        quoted_etag = '"%s"' % etag
+        if self.headers.get('If-None-Match') == quoted_etag:
+            self.send_response(304)
+            self.send_header('ETag', quoted_etag)
+            self.end_headers()
+            return
+        
+        gzipped = self.accepts_gzip()
+        if gzipped:
+            body = body_gz
+        
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', len(body))
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('ETag', quoted_etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
     
-    def get_dashboard_html(self):
+    @staticmethod
+    def get_dashboard_html():
         """Generate dashboard HTML"""
-        return """
+        return DASHBOARD_HTML.format(css_version=STATIC_FILES['/static/dashboard.css'][2],
+                                     js_version=STATIC_FILES['/static/dashboard.js'][2])
+
+
+DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -164,147 +598,7 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Security Bot Enterprise - Dashboard</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: #333;
-            min-height: 100vh;
-        }
-        
-        .header {
-            background: rgba(0,0,0,0.1);
-            color: white;
-            padding: 20px;
-            text-align: center;
-            backdrop-filter: blur(10px);
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        .dashboard-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .card {
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }
-        
-        .card:hover {
-            transform: translateY(-5px);
-        }
-        
-        .card h3 {
-            color: #2c3e50;
-            margin-bottom: 15px;
-            font-size: 18px;
-        }
-        
-        .metric {
-            text-align: center;
-            padding: 20px;
-        }
-        
-        .metric-value {
-            font-size: 36px;
-            font-weight: bold;
-            color: #3498db;
-            margin-bottom: 10px;
-        }
-        
-        .metric-label {
-            color: #7f8c8d;
-            font-size: 14px;
-        }
-        
-        .threat-list {
-            max-height: 300px;
-            overflow-y: auto;
-        }
-        
-        .threat-item {
-            padding: 10px;
-            margin: 5px 0;
-            border-left: 4px solid #3498db;
-            background: #f8f9fa;
-            border-radius: 4px;
-        }
-        
-        .threat-item.critical {
-            border-left-color: #e74c3c;
-        }
-        
-        .threat-item.high {
-            border-left-color: #f39c12;
-        }
-        
-        .threat-item.medium {
-            border-left-color: #f1c40f;
-        }
-        
-        .threat-item.low {
-            border-left-color: #27ae60;
-        }
-        
-        .threat-type {
-            font-weight: bold;
-            color: #2c3e50;
-        }
-        
-        .threat-time {
-            font-size: 12px;
-            color: #7f8c8d;
-            float: right;
-        }
-        
-        .chart-container {
-            position: relative;
-            height: 300px;
-        }
-        
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }
-        
-        .status-online {
-            background: #27ae60;
-            box-shadow: 0 0 10px rgba(39, 174, 96, 0.5);
-        }
-        
-        .auto-refresh {
-            text-align: center;
-            margin-top: 20px;
-            color: white;
-            font-size: 14px;
-        }
-        
-        @media (max-width: 768px) {
-            .dashboard-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="/static/dashboard.css?v={css_version}">
 </head>
 <body>
     <div class="header">
@@ -367,143 +661,360 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
         </div>
         
         <div class="auto-refresh">
-            Dashboard updates automatically every 30 seconds
+            Dashboard updates automatically
         </div>
     </div>
     
-    <script>
-        let severityChart = null;
-        let hourlyChart = null;
-        
-        // Initialize charts
-        function initCharts() {
-            // Severity distribution chart
-            const severityCtx = document.getElementById('severityChart').getContext('2d');
-            severityChart = new Chart(severityCtx, {
-                type: 'doughnut',
-                data: {
-                    labels: ['Critical', 'High', 'Medium', 'Low'],
-                    datasets: [{
-                        data: [0, 0, 0, 0],
-                        backgroundColor: ['#e74c3c', '#f39c12', '#f1c40f', '#27ae60'],
-                        borderWidth: 2,
-                        borderColor: '#fff'
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {
-                        legend: {
-                            position: 'bottom'
-                        }
-                    }
-                }
-            });
-            
-            // Hourly activity chart
-            const hourlyCtx = document.getElementById('hourlyChart').getContext('2d');
-            hourlyChart = new Chart(hourlyCtx, {
-                type: 'line',
-                data: {
-                    labels: Array.from({length: 24}, (_, i) => i.toString().padStart(2, '0') + ':00'),
-                    datasets: [{
-                        label: 'Threats Detected',
-                        data: new Array(24).fill(0),
-                        borderColor: '#3498db',
-                        backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                        fill: true,
-                        tension: 0.4
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            beginAtZero: true
-                        }
-                    }
+    <script src="/static/dashboard.js?v={js_version}"></script>
+</body>
+</html>
+"""
+
+DASHBOARD_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: #333;
+    min-height: 100vh;
+}
+
+.header {
+    background: rgba(0,0,0,0.1);
+    color: white;
+    padding: 20px;
+    text-align: center;
+    backdrop-filter: blur(10px);
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
+
+.dashboard-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+    gap: 20px;
+    margin-bottom: 20px;
+}
+
+.card {
+    background: white;
+    border-radius: 10px;
+    padding: 20px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+    transition: transform 0.3s ease;
+}
+
+.card:hover {
+    transform: translateY(-5px);
+}
+
+.card h3 {
+    color: #2c3e50;
+    margin-bottom: 15px;
+    font-size: 18px;
+}
+
+.metric {
+    text-align: center;
+    padding: 20px;
+}
+
+.metric-value {
+    font-size: 36px;
+    font-weight: bold;
+    color: #3498db;
+    margin-bottom: 10px;
+}
+
+.metric-label {
+    color: #7f8c8d;
+    font-size: 14px;
+}
+
+.threat-list {
+    max-height: 300px;
+    overflow-y: auto;
+}
+
+.threat-item {
+    padding: 10px;
+    margin: 5px 0;
+    border-left: 4px solid #3498db;
+    background: #f8f9fa;
+    border-radius: 4px;
+}
+
+.threat-item.critical {
+    border-left-color: #e74c3c;
+}
+
+.threat-item.high {
+    border-left-color: #f39c12;
+}
+
+.threat-item.medium {
+    border-left-color: #f1c40f;
+}
+
+.threat-item.low {
+    border-left-color: #27ae60;
+}
+
+.threat-type {
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+.threat-time {
+    font-size: 12px;
+    color: #7f8c8d;
+    float: right;
+}
+
+.threat-description {
+    margin-top: 5px;
+    font-size: 14px;
+}
+
+.threat-empty {
+    text-align: center;
+    color: #7f8c8d;
+    padding: 20px;
+}
+
+.chart-container {
+    position: relative;
+    height: 300px;
+}
+
+.status-indicator {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    margin-right: 8px;
+}
+
+.status-online {
+    background: #27ae60;
+    box-shadow: 0 0 10px rgba(39, 174, 96, 0.5);
+}
+
+.auto-refresh {
+    text-align: center;
+    margin-top: 20px;
+    color: white;
+    font-size: 14px;
+}
+
+@media (max-width: 768px) {
+    .dashboard-grid {
+        grid-template-columns: 1fr;
+    }
+}
+"""
+
+DASHBOARD_JS = """
+let severityChart = null;
+let hourlyChart = null;
+const CACHE_KEY = 'dashboard-data:v2:' + location.pathname;
+// Row elements reused across updates, created on first use
+const threatRows = [];
+// Building a formatter is costly, so make one and reuse it every update
+const TIME_FORMAT = new Intl.DateTimeFormat(undefined, {timeStyle: 'medium'});
+
+// Initialize charts
+function initCharts() {
+    // Severity distribution chart
+    const severityCtx = document.getElementById('severityChart').getContext('2d');
+    severityChart = new Chart(severityCtx, {
+        type: 'doughnut',
+        data: {
+            labels: ['Critical', 'High', 'Medium', 'Low'],
+            datasets: [{
+                data: [0, 0, 0, 0],
+                backgroundColor: ['#e74c3c', '#f39c12', '#f1c40f', '#27ae60'],
+                borderWidth: 2,
+                borderColor: '#fff'
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'bottom'
                 }
-            });
-        }
-        
-        // Update dashboard data
-        function updateDashboard() {
-            fetch('/api/dashboard-data')
-                .then(response => response.json())
-                .then(data => {
-                    // Update metrics
-                    document.getElementById('totalThreats').textContent = data.total_threats_24h || 0;
-                    document.getElementById('lastUpdate').textContent = new Date(data.last_updated).toLocaleTimeString();
-                    
-                    // Update severity chart
-                    if (severityChart) {
-                        const severityData = data.severity_distribution || {};
-                        severityChart.data.datasets[0].data = [
-                            severityData.critical || 0,
-                            severityData.high || 0,
-                            severityData.medium || 0,
-                            severityData.low || 0
-                        ];
-                        severityChart.update();
-                    }
-                    
-                    // Update hourly chart
-                    if (hourlyChart) {
-                        const hourlyData = new Array(24).fill(0);
-                        if (data.hourly_distribution) {
-                            data.hourly_distribution.forEach(([hour, count]) => {
-                                hourlyData[parseInt(hour)] = count;
-                            });
-                        }
-                        hourlyChart.data.datasets[0].data = hourlyData;
-                        hourlyChart.update();
-                    }
-                    
-                    // Update recent threats
-                    updateThreatList(data.recent_threats || []);
-                })
-                .catch(error => {
-                    console.error('Error updating dashboard:', error);
-                });
+            }
         }
-        
-        // Update threat list
-        function updateThreatList(threats) {
-            const threatList = document.getElementById('threatList');
-            
-            if (threats.length === 0) {
-                threatList.innerHTML = '<div style="text-align: center; color: #7f8c8d; padding: 20px;">No recent threats detected</div>';
-                return;
+    });
+    
+    // Hourly activity chart
+    const hourlyCtx = document.getElementById('hourlyChart').getContext('2d');
+    hourlyChart = new Chart(hourlyCtx, {
+        type: 'line',
+        data: {
+            labels: Array.from({length: 24}, (_, i) => i.toString().padStart(2, '0') + ':00'),
+            datasets: [{
+                label: 'Threats Detected',
+                data: new Array(24).fill(0),
+                borderColor: '#3498db',
+                backgroundColor: 'rgba(52, 152, 219, 0.1)',
+                fill: true,
+                tension: 0.4
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true
+                }
             }
-            
-            threatList.innerHTML = threats.map(threat => {
-                const [type, severity, timestamp, description] = threat;
-                const time = new Date(timestamp).toLocaleString();
-                
-                return `
-                    <div class="threat-item ${severity}">
-                        <span class="threat-type">${type.replace(/_/g, ' ').toUpperCase()}</span>
-                        <span class="threat-time">${time}</span>
-                        <div style="margin-top: 5px; font-size: 14px;">${description || 'No description available'}</div>
-                    </div>
-                `;
-            }).join('');
         }
-        
-        // Initialize dashboard
-        document.addEventListener('DOMContentLoaded', function() {
-            initCharts();
-            updateDashboard();
-            
-            // Auto-refresh every 30 seconds
-            setInterval(updateDashboard, 30000);
+    });
+}
+
+// Render a fresh snapshot and remember it for the next page load
+function receiveData(data) {
+    applyData(data);
+    try {
+        localStorage.setItem(CACHE_KEY, JSON.stringify(data));
+    } catch (e) {
+        // Storage full or disabled; the next update repaints anyway
+    }
+}
+
+// Update dashboard data
+function updateDashboard() {
+    fetch('/api/dashboard-data', {cache: 'default'})
+        .then(response => response.json())
+        .then(receiveData)
+        .catch(error => {
+            console.error('Error updating dashboard:', error);
         });
-    </script>
-</body>
-</html>
-        """
+}
+
+// Paint the last snapshot seen by this browser before the first fetch returns
+function applyCachedData() {
+    try {
+        const cached = localStorage.getItem(CACHE_KEY);
+        if (cached) {
+            applyData(JSON.parse(cached));
+        }
+    } catch (e) {
+        localStorage.removeItem(CACHE_KEY);
+    }
+}
+
+// Render a dashboard data snapshot
+function applyData(data) {
+    // Update metrics
+    document.getElementById('totalThreats').textContent = data.total_threats_24h || 0;
+    document.getElementById('lastUpdate').textContent = TIME_FORMAT.format(new Date(data.last_updated));
+    
+    // Update severity chart
+    if (severityChart) {
+        const severityData = data.severity_distribution || {};
+        severityChart.data.datasets[0].data = [
+            severityData.critical || 0,
+            severityData.high || 0,
+            severityData.medium || 0,
+            severityData.low || 0
+        ];
+        severityChart.update();
+    }
+    
+    // Update hourly chart
+    if (hourlyChart) {
+        const hourlyData = data.hourly_distribution;
+        hourlyChart.data.datasets[0].data = Array.isArray(hourlyData) && hourlyData.length === 24
+            ? hourlyData
+            : new Array(24).fill(0);
+        hourlyChart.update();
+    }
+    
+    // Update recent threats
+    updateThreatList(data.recent_threats || []);
+}
+
+// Build one threat row; its text is filled in by updateThreatList
+function createThreatRow() {
+    const item = document.createElement('div');
+    const type = item.appendChild(document.createElement('span'));
+    const time = item.appendChild(document.createElement('span'));
+    const description = item.appendChild(document.createElement('div'));
+    type.className = 'threat-type';
+    time.className = 'threat-time';
+    description.className = 'threat-description';
+    return {item, type, time, description};
+}
+
+// Update threat list
+function updateThreatList(threats) {
+    const threatList = document.getElementById('threatList');
+    
+    if (threats.length === 0) {
+        const empty = document.createElement('div');
+        empty.className = 'threat-empty';
+        empty.textContent = 'No recent threats detected';
+        threatList.replaceChildren(empty);
+        return;
+    }
+    
+    // Rows are pre-formatted by the server; textContent keeps descriptions
+    // from being parsed as HTML
+    threats.forEach((threat, i) => {
+        const row = threatRows[i] || (threatRows[i] = createThreatRow());
+        row.item.className = 'threat-item ' + threat.severity;
+        row.type.textContent = threat.type_display;
+        row.time.textContent = threat.time_display;
+        row.description.textContent = threat.description;
+    });
+    threatList.replaceChildren(...threatRows.slice(0, threats.length).map(row => row.item));
+}
+
+// Initialize dashboard
+document.addEventListener('DOMContentLoaded', function() {
+    initCharts();
+    applyCachedData();
+    
+    // The server pushes each new snapshot; EventSource reconnects by itself
+    if (window.EventSource) {
+        const stream = new EventSource('/api/stream');
+        stream.onmessage = event => receiveData(JSON.parse(event.data));
+    } else {
+        // Fall back to polling every 30 seconds
+        updateDashboard();
+        setInterval(updateDashboard, 30000);
+    }
+});
+"""
+
+
+def _static_asset(text, content_type):
+    """Encode a static asset once as (body, gzipped body, etag, content type)"""
+    body = text.encode('utf-8')
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return body, gzip.compress(body, 6), etag, content_type
+
+
+# Static assets are versioned by ETag in their URLs, so browsers may cache
+# them indefinitely and only fetch the HTML shell on reload
+STATIC_FILES = {
+    '/static/dashboard.css': _static_asset(DASHBOARD_CSS, 'text/css; charset=utf-8'),
+    '/static/dashboard.js': _static_asset(DASHBOARD_JS, 'application/javascript; charset=utf-8'),
+}
 
 
 if __name__ == '__main__':
@@ -3,400 +3,348 @@ Security Bot Enterprise - Reporting System
 Automated PDF report generation with security analytics
 """
 
+import gzip
 import sqlite3
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-import io
-import base64
+from string import Template
+from typing import Callable, Optional, Tuple
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class ReportingSystem:
-    """Enterprise reporting system with PDF generation"""
-    
-    def __init__(self, db_path="security_bot.db", output_dir="reports"):
-        self.db_path = db_path
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-        self.setup_logging()
-    
-    def setup_logging(self):
-        """Setup reporting logging"""
-        self.logger = logging.getLogger('ReportingSystem')
-    
-    def generate_threat_summary_report(self, days=30, format_type='html'):
-        """Generate threat summary report"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            # Total threats by severity
-            cursor.execute("""
-                SELECT severity, COUNT(*) as count
-                FROM threats 
-                WHERE detected_at >= ? AND detected_at <= ?
-                GROUP BY severity
-                ORDER BY count DESC
-            """, (start_date.isoformat(), end_date.isoformat()))
-            
-            severity_data = cursor.fetchall()
-            
-            # Daily threat trends
-            cursor.execute("""
-                SELECT DATE(detected_at) as date, COUNT(*) as count
-                FROM threats 
-                WHERE detected_at >= ? AND detected_at <= ?
-                GROUP BY DATE(detected_at)
-                ORDER BY date
-            """, (start_date.isoformat(), end_date.isoformat()))
-            
-            daily_trends = cursor.fetchall()
-            
-            # Top threat types
-            cursor.execute("""
-                SELECT threat_type, COUNT(*) as count, 
-                       AVG(risk_score) as avg_risk_score
-                FROM threats 
-                WHERE detected_at >= ? AND detected_at <= ?
-                GROUP BY threat_type
-                ORDER BY count DESC
-                LIMIT 10
-            """, (start_date.isoformat(), end_date.isoformat()))
-            
-            threat_types = cursor.fetchall()
-            
-            # Recent critical threats
-            cursor.execute("""
-                SELECT threat_id, threat_type, source, target, 
-                       description, detected_at, risk_score
-                FROM threats 
-                WHERE severity = 'critical' 
-                AND detected_at >= ? AND detected_at <= ?
-                ORDER BY detected_at DESC
-                LIMIT 10
-            """, (start_date.isoformat(), end_date.isoformat()))
-            
-            critical_threats = cursor.fetchall()
-            
-            conn.close()
-            
-            # Generate report data
-            report_data = {
-                'title': 'Security Threat Summary Report',
-                'period': f'{start_date.strftime("%Y-%m-%d")} to {end_date.strftime("%Y-%m-%d")}',
-                'generated_at': datetime.now().isoformat(),
-                'summary': {
-                    'total_threats': sum([row[1] for row in severity_data]),
-                    'critical_threats': next((row[1] for row in severity_data if row[0] == 'critical'), 0),
-                    'days_analyzed': days
-                },
-                'severity_distribution': severity_data,
-                'daily_trends': daily_trends,
-                'top_threat_types': threat_types,
-                'critical_threats': critical_threats
-            }
-            
-            # Generate report based on format
-            if format_type.lower() == 'html':
-                return self._generate_html_report(report_data)
-            elif format_type.lower() == 'json':
-                return self._generate_json_report(report_data)
-            else:
-                return self._generate_text_report(report_data)
-                
-        except Exception as e:
-            self.logger.error("Failed to generate threat summary report: %s", e)
-            return None
-    
-    def generate_network_activity_report(self, hours=24, format_type='html'):
-        """Generate network activity report"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get date range
-            end_time = datetime.now()
-            start_time = end_time - timedelta(hours=hours)
-            
-            # Total network activity
-            cursor.execute("""
-                SELECT COUNT(*) as total_connections,
-                       SUM(bytes_sent + bytes_received) as total_bytes,
-                       AVG(connection_duration) as avg_duration
-                FROM network_activity 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            activity_summary = cursor.fetchone()
-            
-            # Top source IPs
-            cursor.execute("""
-                SELECT source_ip, COUNT(*) as connections,
-                       SUM(bytes_sent + bytes_received) as total_bytes
-                FROM network_activity 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-                GROUP BY source_ip
-                ORDER BY connections DESC
-                LIMIT 10
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            top_sources = cursor.fetchall()
-            
-            # Protocol distribution
-            cursor.execute("""
-                SELECT protocol, COUNT(*) as count,
-                       SUM(bytes_sent + bytes_received) as total_bytes
-                FROM network_activity 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-                GROUP BY protocol
-                ORDER BY count DESC
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            protocol_stats = cursor.fetchall()
-            
-            # Hourly activity pattern
-            cursor.execute("""
-                SELECT strftime('%H', recorded_at) as hour, 
-                       COUNT(*) as connections
-                FROM network_activity 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-                GROUP BY strftime('%H', recorded_at)
-                ORDER BY hour
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            hourly_pattern = cursor.fetchall()
-            
-            conn.close()
-            
-            # Generate report data
-            report_data = {
-                'title': 'Network Activity Report',
-                'period': f'{start_time.strftime("%Y-%m-%d %H:%M")} to {end_time.strftime("%Y-%m-%d %H:%M")}',
-                'generated_at': datetime.now().isoformat(),
-                'summary': {
-                    'total_connections': activity_summary[0] or 0,
-                    'total_bytes': activity_summary[1] or 0,
-                    'average_duration': round(activity_summary[2] or 0, 2),
-                    'hours_analyzed': hours
-                },
-                'top_source_ips': top_sources,
-                'protocol_distribution': protocol_stats,
-                'hourly_pattern': hourly_pattern
-            }
-            
-            # Generate report based on format
-            if format_type.lower() == 'html':
-                return self._generate_network_html_report(report_data)
-            elif format_type.lower() == 'json':
-                return self._generate_json_report(report_data)
-            else:
-                return self._generate_text_report(report_data)
-                
-        except Exception as e:
-            self.logger.error("Failed to generate network activity report: %s", e)
-            return None
-    
-    def generate_system_health_report(self, hours=24, format_type='html'):
-        """Generate system health report"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get date range
-            end_time = datetime.now()
-            start_time = end_time - timedelta(hours=hours)
-            
-            # System metrics summary
-            cursor.execute("""
-                SELECT AVG(cpu_usage) as avg_cpu,
-                       MAX(cpu_usage) as max_cpu,
-                       AVG(memory_usage) as avg_memory,
-                       MAX(memory_usage) as max_memory,
-                       AVG(disk_usage) as avg_disk,
-                       COUNT(*) as data_points
-                FROM system_metrics 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            metrics_summary = cursor.fetchone()
-            
-            # Resource usage trends
-            cursor.execute("""
-                SELECT strftime('%H', recorded_at) as hour,
-                       AVG(cpu_usage) as avg_cpu,
-                       AVG(memory_usage) as avg_memory,
-                       AVG(disk_usage) as avg_disk
-                FROM system_metrics 
-                WHERE recorded_at >= ? AND recorded_at <= ?
-                GROUP BY strftime('%H', recorded_at)
-                ORDER BY hour
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            hourly_metrics = cursor.fetchall()
-            
-            # Alert history
-            cursor.execute("""
-                SELECT status, COUNT(*) as count
-                FROM alert_history 
-                WHERE created_at >= ? AND created_at <= ?
-                GROUP BY status
-            """, (start_time.isoformat(), end_time.isoformat()))
-            
-            alert_stats = cursor.fetchall()
-            
-            conn.close()
-            
-            # Generate report data
-            report_data = {
-                'title': 'System Health Report',
-                'period': f'{start_time.strftime("%Y-%m-%d %H:%M")} to {end_time.strftime("%Y-%m-%d %H:%M")}',
-                'generated_at': datetime.now().isoformat(),
-                'summary': {
-                    'avg_cpu_usage': round(metrics_summary[0] or 0, 2),
-                    'max_cpu_usage': round(metrics_summary[1] or 0, 2),
-                    'avg_memory_usage': round(metrics_summary[2] or 0, 2),
-                    'max_memory_usage': round(metrics_summary[3] or 0, 2),
-                    'avg_disk_usage': round(metrics_summary[4] or 0, 2),
-                    'data_points': metrics_summary[5] or 0,
-                    'hours_analyzed': hours
-                },
-                'hourly_metrics': hourly_metrics,
-                'alert_statistics': alert_stats
-            }
-            
-            # Generate report based on format
-            if format_type.lower() == 'html':
-                return self._generate_health_html_report(report_data)
-            elif format_type.lower() == 'json':
-                return self._generate_json_report(report_data)
-            else:
-                return self._generate_text_report(report_data)
-                
-        except Exception as e:
-            self.logger.error("Failed to generate system health report: %s", e)
-            return None
-    
-    def _generate_html_report(self, report_data):
-        """Generate HTML threat summary report"""
-        html_template = """
-<!DOCTYPE html>
+
+# Report queries are constant text with the time window bound as parameters,
+# so the shared connection compiles each of them only once
+
+# Threat summary sections in one statement: the window is selected once in a CTE
+# and each section's rows are tagged with its name and position, then dealt out
+# into per-section lists by the caller. Columns: section, position, then up to
+# seven section-specific values padded with NULLs.
+THREAT_SUMMARY_SQL = """
+    WITH w AS (
+        SELECT threat_id, threat_type, severity, source, target,
+               description, detected_at, risk_score
+        FROM threats
+        WHERE detected_at >= ? AND detected_at <= ?
+    )
+    SELECT 'severity', ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC),
+           severity, COUNT(*), 100.0 * COUNT(*) / SUM(COUNT(*)) OVER (),
+           NULL, NULL, NULL, NULL
+    FROM w
+    GROUP BY severity
+    UNION ALL
+    SELECT 'daily', ROW_NUMBER() OVER (ORDER BY DATE(detected_at)),
+           DATE(detected_at), COUNT(*), NULL, NULL, NULL, NULL, NULL
+    FROM w
+    GROUP BY DATE(detected_at)
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'type', ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC),
+               threat_type, COUNT(*), AVG(risk_score), NULL, NULL, NULL, NULL
+        FROM w
+        GROUP BY threat_type
+        ORDER BY COUNT(*) DESC
+        LIMIT 10
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'critical', ROW_NUMBER() OVER (ORDER BY detected_at DESC),
+               threat_id, threat_type, source, target, description,
+               detected_at, risk_score
+        FROM w
+        WHERE severity = 'critical'
+        ORDER BY detected_at DESC
+        LIMIT 10
+    )
+    ORDER BY 1, 2
+"""
+
+# Network activity report
+NETWORK_SUMMARY_SQL = """
+    SELECT COUNT(*) as total_connections,
+           SUM(total_bytes) as total_bytes,
+           AVG(connection_duration) as avg_duration
+    FROM network_activity
+    WHERE recorded_at >= ? AND recorded_at <= ?
+"""
+
+TOP_SOURCES_SQL = """
+    SELECT source_ip, COUNT(*) as connections,
+           SUM(total_bytes) as total_bytes
+    FROM network_activity
+    WHERE recorded_at >= ? AND recorded_at <= ?
+    GROUP BY source_ip
+    ORDER BY connections DESC
+    LIMIT 10
+"""
+
+PROTOCOL_STATS_SQL = """
+    SELECT protocol, COUNT(*) as count,
+           SUM(total_bytes) as total_bytes
+    FROM network_activity
+    WHERE recorded_at >= ? AND recorded_at <= ?
+    GROUP BY protocol
+    ORDER BY count DESC
+"""
+
+NETWORK_HOURLY_SQL = """
+    SELECT strftime('%H', recorded_at) as hour,
+           COUNT(*) as connections
+    FROM network_activity
+    WHERE recorded_at >= ? AND recorded_at <= ?
+    GROUP BY strftime('%H', recorded_at)
+    ORDER BY hour
+"""
+
+# System health report
+METRICS_SUMMARY_SQL = """
+    SELECT AVG(cpu_usage) as avg_cpu,
+           MAX(cpu_usage) as max_cpu,
+           AVG(memory_usage) as avg_memory,
+           MAX(memory_usage) as max_memory,
+           AVG(disk_usage) as avg_disk,
+           COUNT(*) as data_points
+    FROM system_metrics
+    WHERE recorded_at >= ? AND recorded_at <= ?
+"""
+
+# Hour-of-day averages come from the system_metrics_hourly rollup: the window's
+# hourly buckets are combined weighted by their sample counts. Buckets are
+# whole hours, so the window's first, partial hour is averaged from
+# system_metrics instead. Its upper bound takes the date/time separator from
+# the window start, so it compares like the lower bound does.
+METRICS_HOURLY_SQL = """
+    WITH buckets (hour, avg_cpu, avg_memory, avg_disk, samples) AS (
+        SELECT hour, avg_cpu, avg_memory, avg_disk, samples
+        FROM system_metrics_hourly
+        WHERE hour > strftime('%Y-%m-%d %H:00', ?1) AND hour <= ?2
+        UNION ALL
+        SELECT strftime('%Y-%m-%d %H:00', recorded_at),
+               AVG(cpu_usage), AVG(memory_usage), AVG(disk_usage), COUNT(*)
+        FROM system_metrics
+        WHERE recorded_at >= ?1 AND recorded_at <= ?2
+          AND recorded_at < replace(strftime('%Y-%m-%d %H:00', ?1, '+1 hour'),
+                                    ' ', substr(?1, 11, 1))
+        GROUP BY 1
+    )
+    SELECT substr(hour, 12, 2) as hour,
+           SUM(avg_cpu * samples) / SUM(samples) as avg_cpu,
+           SUM(avg_memory * samples) / SUM(samples) as avg_memory,
+           SUM(avg_disk * samples) / SUM(samples) as avg_disk
+    FROM buckets
+    GROUP BY substr(hour, 12, 2)
+    ORDER BY hour
+"""
+
+# The same hour-of-day averages scanned from system_metrics, used when the
+# rollup tables cannot be set up (a read-only or locked database)
+METRICS_HOURLY_SCAN_SQL = """
+    SELECT strftime('%H', recorded_at) as hour,
+           AVG(cpu_usage) as avg_cpu,
+           AVG(memory_usage) as avg_memory,
+           AVG(disk_usage) as avg_disk
+    FROM system_metrics
+    WHERE recorded_at >= ? AND recorded_at <= ?
+    GROUP BY strftime('%H', recorded_at)
+    ORDER BY hour
+"""
+
+# system_metrics_rollup_state holds the highest system_metrics rowid already
+# rolled up. A database rolled up before it existed is rebuilt from scratch.
+METRICS_ROLLUP_DDL = """
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS system_metrics_hourly (
+        hour TEXT PRIMARY KEY,
+        avg_cpu REAL,
+        avg_memory REAL,
+        avg_disk REAL,
+        samples INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS system_metrics_rollup_state (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        last_rowid INTEGER NOT NULL
+    );
+    DELETE FROM system_metrics_hourly
+    WHERE NOT EXISTS (SELECT 1 FROM system_metrics_rollup_state);
+    INSERT OR IGNORE INTO system_metrics_rollup_state (id, last_rowid) VALUES (0, 0);
+    COMMIT;
+"""
+
+# Incremental refresh: fold the rows added since the last refresh into the
+# buckets of whatever hours they fall in, however old, then move the high-water
+# mark. system_metrics ids are AUTOINCREMENT, so new rows always sort above it.
+METRICS_ROLLUP_REFRESH_SQL = """
+    BEGIN IMMEDIATE;
+    INSERT INTO system_metrics_hourly (hour, avg_cpu, avg_memory, avg_disk, samples)
+    SELECT strftime('%Y-%m-%d %H:00', recorded_at),
+           AVG(cpu_usage), AVG(memory_usage), AVG(disk_usage), COUNT(*)
+    FROM system_metrics
+    WHERE rowid > (SELECT last_rowid FROM system_metrics_rollup_state)
+    GROUP BY 1
+    ON CONFLICT(hour) DO UPDATE SET
+        avg_cpu = (avg_cpu * samples + excluded.avg_cpu * excluded.samples)
+                  / (samples + excluded.samples),
+        avg_memory = (avg_memory * samples + excluded.avg_memory * excluded.samples)
+                     / (samples + excluded.samples),
+        avg_disk = (avg_disk * samples + excluded.avg_disk * excluded.samples)
+                   / (samples + excluded.samples),
+        samples = samples + excluded.samples;
+    UPDATE system_metrics_rollup_state
+    SET last_rowid = (SELECT COALESCE(MAX(rowid), last_rowid) FROM system_metrics);
+    COMMIT;
+"""
+
+ALERT_STATS_SQL = """
+    SELECT status, COUNT(*) as count
+    FROM alert_history
+    WHERE created_at >= ? AND created_at <= ?
+    GROUP BY status
+"""
+
+# Composite indexes for the report range scans: filter on the timestamp, then
+# group by the second column without going back to the table for it
+REPORT_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_threats_detected_severity ON threats(detected_at, severity)",
+    "CREATE INDEX IF NOT EXISTS idx_threats_detected_type ON threats(detected_at, threat_type)",
+    "CREATE INDEX IF NOT EXISTS idx_network_recorded_protocol ON network_activity(recorded_at, protocol)",
+    "CREATE INDEX IF NOT EXISTS idx_network_recorded_source ON network_activity(recorded_at, source_ip)",
+    "CREATE INDEX IF NOT EXISTS idx_metrics_recorded_at ON system_metrics(recorded_at)",
+)
+
+# The network queries sum the generated network_activity.total_bytes column
+# that DatabaseIntegration creates. Databases made before it existed, or by an
+# SQLite without generated columns, get the per-row sum instead.
+TOTAL_BYTES_SUM = "SUM(total_bytes)"
+TOTAL_BYTES_FALLBACK = "SUM(bytes_sent + bytes_received)"
+
+
+# Page for the threat summary report. A string.Template keeps the CSS braces
+# literal and substitutes the $placeholders without format-spec parsing
+THREAT_SUMMARY_HTML = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>$title</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 10px;
             box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
             border-bottom: 2px solid #3498db;
             padding-bottom: 20px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #2c3e50;
             margin: 0 0 10px 0;
-        }}
-        .header p {{
+        }
+        .header p {
             color: #7f8c8d;
             margin: 5px 0;
-        }}
-        .summary-grid {{
+        }
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .summary-card {{
+        }
+        .summary-card {
             background: linear-gradient(135deg, #3498db, #2980b9);
             color: white;
             padding: 20px;
             border-radius: 8px;
             text-align: center;
-        }}
-        .summary-value {{
+        }
+        .summary-value {
             font-size: 2em;
             font-weight: bold;
             margin-bottom: 10px;
-        }}
-        .summary-label {{
+        }
+        .summary-label {
             font-size: 0.9em;
             opacity: 0.9;
-        }}
-        .section {{
+        }
+        .section {
             margin: 30px 0;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             color: #2c3e50;
             border-bottom: 1px solid #ecf0f1;
             padding-bottom: 10px;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 20px 0;
-        }}
-        th, td {{
+        }
+        th, td {
             text-align: left;
             padding: 12px;
             border-bottom: 1px solid #ecf0f1;
-        }}
-        th {{
+        }
+        th {
             background-color: #f8f9fa;
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .severity-critical {{ color: #e74c3c; font-weight: bold; }}
-        .severity-high {{ color: #f39c12; font-weight: bold; }}
-        .severity-medium {{ color: #f1c40f; font-weight: bold; }}
-        .severity-low {{ color: #27ae60; font-weight: bold; }}
-        .footer {{
+        }
+        .severity-critical { color: #e74c3c; font-weight: bold; }
+        .severity-high { color: #f39c12; font-weight: bold; }
+        .severity-medium { color: #f1c40f; font-weight: bold; }
+        .severity-low { color: #27ae60; font-weight: bold; }
+        .footer {
             text-align: center;
             margin-top: 30px;
             padding-top: 20px;
             border-top: 1px solid #ecf0f1;
             color: #7f8c8d;
             font-size: 0.9em;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>🛡️ {title}</h1>
-            <p><strong>Period:</strong> {period}</p>
-            <p><strong>Generated:</strong> {generated_at}</p>
+            <h1>🛡️ $title</h1>
+            <p><strong>Period:</strong> $period</p>
+            <p><strong>Generated:</strong> $generated_at</p>
         </div>
         
         <div class="summary-grid">
             <div class="summary-card">
-                <div class="summary-value">{total_threats}</div>
+                <div class="summary-value">$total_threats</div>
                 <div class="summary-label">Total Threats</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value">{critical_threats}</div>
+                <div class="summary-value">$critical_threats</div>
                 <div class="summary-label">Critical Threats</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value">{days_analyzed}</div>
+                <div class="summary-value">$days_analyzed</div>
                 <div class="summary-label">Days Analyzed</div>
             </div>
         </div>
@@ -412,7 +360,7 @@ class ReportingSystem:
                     </tr>
                 </thead>
                 <tbody>
-                    {severity_rows}
+                    $severity_rows
                 </tbody>
             </table>
         </div>
@@ -428,7 +376,7 @@ class ReportingSystem:
                     </tr>
                 </thead>
                 <tbody>
-                    {threat_type_rows}
+                    $threat_type_rows
                 </tbody>
             </table>
         </div>
@@ -447,7 +395,7 @@ class ReportingSystem:
                     </tr>
                 </thead>
                 <tbody>
-                    {critical_threat_rows}
+                    $critical_threat_rows
                 </tbody>
             </table>
         </div>
@@ -459,53 +407,476 @@ class ReportingSystem:
     </div>
 </body>
 </html>
-        """
-        
-        # Calculate total for percentages
-        total_threats = report_data['summary']['total_threats']
+""")
+
+# Table rows for the page above, one line each
+SEVERITY_ROW = '<tr><td><span class="severity-{0}">{1}</span></td><td>{2}</td><td>{3:.1f}%</td></tr>'
+THREAT_TYPE_ROW = '<tr><td>{0}</td><td>{1}</td><td>{2:.1f}</td></tr>'
+CRITICAL_THREAT_ROW = ('<tr><td>{0}</td><td>{1}</td><td>{2}</td><td>{3}</td>'
+                       '<td>{4}</td><td>{5}</td></tr>')
+
+
+# Database text is escaped before it goes into report HTML; one translate
+# pass does all five replacements
+HTML_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+
+def escape_html(value):
+    """Escape a string for HTML text or attributes; other values pass through"""
+    return value.translate(HTML_ESCAPES) if isinstance(value, str) else value
+
+
+def display_time(timestamp):
+    """Minute-precision display form of a stored 'YYYY-MM-DD HH:MM:SS' timestamp"""
+    return timestamp[:16].replace('T', ' ') if timestamp else 'N/A'
+
+
+@lru_cache(maxsize=512)
+def threat_label(threat_type):
+    """Escaped display label for a threat type; there are few distinct types, so cache them"""
+    return escape_html(threat_type.replace('_', ' ').title())
+
+
+def iter_rows(cursor, size=256):
+    """Yield a cursor's rows in fetchmany batches instead of materializing them all"""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+# Row lists for JSON reports are encoded by SQLite: each row becomes a JSON
+# array and the rows are aggregated into one array of arrays, returned as text
+JSON_ROWS_SQL = "SELECT json_group_array(json_array({columns})) FROM ({query})"
+
+
+class RawJSON(str):
+    """JSON text SQLite already encoded, spliced into a report as-is"""
+
+
+# HTML reports larger than this are saved as .html.gz; the repeated markup and
+# CSS typically shrink several times over
+GZIP_MIN_BYTES = 65536
+
+# Generated reports are reused while their tables have no newer rows. The
+# window slides with the clock, so entries also expire after REPORT_CACHE_TTL
+# seconds to let old rows age out of it.
+REPORT_CACHE_TTL = 60
+REPORT_CACHE_SIZE = 32
+
+# Cheap change stamps per report: newest row id and timestamp of each source
+REPORT_STAMP_SQL = {
+    'threat_summary': """
+        SELECT (SELECT MAX(rowid) FROM threats), (SELECT MAX(detected_at) FROM threats)
+    """,
+    'network_activity': """
+        SELECT (SELECT MAX(rowid) FROM network_activity),
+               (SELECT MAX(recorded_at) FROM network_activity)
+    """,
+    'system_health': """
+        SELECT (SELECT MAX(rowid) FROM system_metrics),
+               (SELECT MAX(recorded_at) FROM system_metrics),
+               (SELECT MAX(rowid) FROM alert_history)
+    """,
+}
+
+
+def cached_report(name):
+    """Serve a generate_*_report method from the instance's report cache"""
+    def decorate(generate):
+        @wraps(generate)
+        def wrapper(self, *args, **kwargs):
+            stamp = self._report_stamp(name)
+            if stamp is None:
+                return generate(self, *args, **kwargs)
+            
+            key = (name, args, tuple(sorted(kwargs.items())), stamp)
+            now = time.monotonic()
+            with self._report_cache_lock:
+                entry = self._report_cache.get(key)
+                if entry is not None and entry[0] > now:
+                    self._report_cache.move_to_end(key)
+                    return entry[1]
+            
+            report = generate(self, *args, **kwargs)
+            if report is not None:
+                with self._report_cache_lock:
+                    self._report_cache[key] = (now + REPORT_CACHE_TTL, report)
+                    self._report_cache.move_to_end(key)
+                    while len(self._report_cache) > REPORT_CACHE_SIZE:
+                        self._report_cache.popitem(last=False)
+            return report
+        return wrapper
+    return decorate
+
+
+def fetch_one(cursor):
+    """First row of the result"""
+    return cursor.fetchone()
+
+
+def fetch_all(cursor):
+    """All rows of the result"""
+    return cursor.fetchall()
+
+
+def fetch_threat_sections(cursor):
+    """Deal THREAT_SUMMARY_SQL's tagged rows out into per-section lists"""
+    sections = {'severity': [], 'daily': [], 'type': [], 'critical': []}
+    # Number of meaningful columns in each section's rows
+    widths = {'severity': 3, 'daily': 2, 'type': 3, 'critical': 7}
+    for row in iter_rows(cursor):
+        kind = row[0]
+        sections[kind].append(row[2:2 + widths[kind]])
+    return sections
+
+
+def build_threat_summary(results, days):
+    """Threat summary sections from the dealt-out query rows"""
+    sections = results['sections']
+    severity_data = sections['severity']
+    return {
+        'summary': {
+            'total_threats': sum([row[1] for row in severity_data]),
+            'critical_threats': next((row[1] for row in severity_data if row[0] == 'critical'), 0),
+            'days_analyzed': days
+        },
+        'severity_distribution': severity_data,
+        'daily_trends': sections['daily'],
+        'top_threat_types': sections['type'],
+        'critical_threats': sections['critical']
+    }
+
+
+def build_network_activity(results, hours):
+    """Network activity sections from its query results"""
+    activity_summary = results['summary']
+    return {
+        'summary': {
+            'total_connections': activity_summary[0] or 0,
+            'total_bytes': activity_summary[1] or 0,
+            'average_duration': round(activity_summary[2] or 0, 2),
+            'hours_analyzed': hours
+        },
+        'top_source_ips': results['top_sources'],
+        'protocol_distribution': results['protocols'],
+        'hourly_pattern': results['hourly']
+    }
+
+
+def build_system_health(results, hours):
+    """System health sections from its query results"""
+    metrics_summary = results['summary']
+    return {
+        'summary': {
+            'avg_cpu_usage': round(metrics_summary[0] or 0, 2),
+            'max_cpu_usage': round(metrics_summary[1] or 0, 2),
+            'avg_memory_usage': round(metrics_summary[2] or 0, 2),
+            'max_memory_usage': round(metrics_summary[3] or 0, 2),
+            'avg_disk_usage': round(metrics_summary[4] or 0, 2),
+            'data_points': metrics_summary[5] or 0,
+            'hours_analyzed': hours
+        },
+        'hourly_metrics': results['hourly'],
+        'alert_statistics': results['alerts']
+    }
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """What one report queries over its window and how it is rendered"""
+    name: str
+    title: str
+    unit: str  # timedelta keyword the period is counted in
+    period_format: str
+    queries: Tuple[Tuple[str, str, Callable], ...]  # (result key, SQL, fetch)
+    build: Callable  # (results, period) -> report sections after the header
+    html_renderer: str  # ReportingSystem method for the html format
+    refresh_sql: Optional[str] = None  # brings a rollup up to date before the queries
+    scan_queries: Tuple[Tuple[str, str], ...] = ()  # (result key, SQL) used without the rollup
+
+
+THREAT_SUMMARY_REPORT = ReportSpec(
+    name='threat_summary',
+    title='Security Threat Summary Report',
+    unit='days',
+    period_format='%Y-%m-%d',
+    queries=(('sections', THREAT_SUMMARY_SQL, fetch_threat_sections),),
+    build=build_threat_summary,
+    html_renderer='_generate_html_report',
+)
+
+NETWORK_ACTIVITY_REPORT = ReportSpec(
+    name='network_activity',
+    title='Network Activity Report',
+    unit='hours',
+    period_format='%Y-%m-%d %H:%M',
+    queries=(
+        ('summary', NETWORK_SUMMARY_SQL, fetch_one),
+        ('top_sources', TOP_SOURCES_SQL, fetch_all),
+        ('protocols', PROTOCOL_STATS_SQL, fetch_all),
+        ('hourly', NETWORK_HOURLY_SQL, fetch_all),
+    ),
+    build=build_network_activity,
+    html_renderer='_generate_network_html_report',
+)
+
+SYSTEM_HEALTH_REPORT = ReportSpec(
+    name='system_health',
+    title='System Health Report',
+    unit='hours',
+    period_format='%Y-%m-%d %H:%M',
+    queries=(
+        ('summary', METRICS_SUMMARY_SQL, fetch_one),
+        ('hourly', METRICS_HOURLY_SQL, fetch_all),
+        ('alerts', ALERT_STATS_SQL, fetch_all),
+    ),
+    build=build_system_health,
+    html_renderer='_generate_health_html_report',
+    refresh_sql=METRICS_ROLLUP_REFRESH_SQL,
+    scan_queries=(('hourly', METRICS_HOURLY_SCAN_SQL),),
+)
+
+
+class ReportingSystem:
+    """Enterprise reporting system with PDF generation"""
+    
+    # Renderers for the formats every report shares; html is per report and
+    # unknown formats fall back to text
+    FORMAT_RENDERERS = {
+        'json': '_generate_json_report',
+        'text': '_generate_text_report',
+    }
+    
+    # Databases whose report indexes were already ensured by this process
+    _indexed_databases = set()
+    
+    # JSON_ROWS_SQL wrappers by the query they wrap
+    _json_rows_queries = {}
+    
+    def __init__(self, db_path="security_bot.db", output_dir="reports", compress_html=True):
+        self.db_path = db_path
+        self.output_dir = Path(output_dir)
+        # Large HTML reports are saved gzipped unless this is turned off
+        self.compress_html = compress_html
+        self.output_dir.mkdir(exist_ok=True)
+        self.setup_logging()
+        self._conn = self._connect()
+        self._total_bytes_column = False
+        # Cleared if the metrics rollup cannot be set up on this database
+        self._metrics_rollup = True
+        self._ensure_indexes()
+        # Per-thread read-only connections used by schedule_reports workers
+        self._local = threading.local()
+        self._report_cache = OrderedDict()
+        self._report_cache_lock = threading.Lock()
+    
+    def setup_logging(self):
+        """Setup reporting logging"""
+        self.logger = logging.getLogger('ReportingSystem')
+    
+    def _connect(self):
+        """Open the connection shared by all reports
         
-        # Generate severity rows
-        severity_rows = ""
-        for severity, count in report_data['severity_distribution']:
-            percentage = (count / total_threats * 100) if total_threats > 0 else 0
-            severity_class = f"severity-{severity}"
-            severity_rows += f"""
-                <tr>
-                    <td><span class="{severity_class}">{severity.upper()}</span></td>
-                    <td>{count}</td>
-                    <td>{percentage:.1f}%</td>
-                </tr>
-            """
+        Keeping it open lets SQLite's page cache survive from one report to
+        the next. Reports only read, so autocommit mode never holds a write
+        transaction open. connect()'s default 5s timeout covers busy waits.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL").fetchone()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456").fetchone()
+        return conn
+    
+    def _connect_read_only(self):
+        """Open a read-only connection for one report worker thread
         
-        # Generate threat type rows
-        threat_type_rows = ""
-        for threat_type, count, avg_risk in report_data['top_threat_types']:
-            threat_type_rows += f"""
-                <tr>
-                    <td>{threat_type.replace('_', ' ').title()}</td>
-                    <td>{count}</td>
-                    <td>{avg_risk:.1f}</td>
-                </tr>
-            """
+        The shared connection has already switched the database to WAL, so
+        these readers run concurrently with each other and with writers.
+        """
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        return conn
+    
+    def _cursor(self):
+        """Cursor on this thread's report connection, or the shared one"""
+        conn = getattr(self._local, 'conn', None)
+        return (conn or self._conn).cursor()
+    
+    def _ensure_indexes(self):
+        """Create the report indexes and rollup table once per database per process"""
+        if self.db_path in ReportingSystem._indexed_databases:
+            return
+        complete = True
+        try:
+            self._execute_script(METRICS_ROLLUP_DDL)
+        except sqlite3.OperationalError as e:
+            # Read-only or locked: report from system_metrics directly
+            self.logger.warning("Metrics rollup unavailable, scanning system_metrics: %s", e)
+            self._metrics_rollup = False
+            complete = False
+        for statement in REPORT_INDEXES:
+            try:
+                self._conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                complete = False
+                if str(e).startswith('no such table'):
+                    # The owning component has not created this table yet;
+                    # retry with the next ReportingSystem on this database
+                    self.logger.debug("Skipping report index: %s", e)
+                    continue
+                # Read-only or locked: the remaining indexes would fail the
+                # same way, each after a busy wait. Reports run without them.
+                self.logger.warning("Report indexes not created: %s", e)
+                break
+        if complete:
+            ReportingSystem._indexed_databases.add(self.db_path)
+    
+    def _execute_script(self, script):
+        """Run a BEGIN ... COMMIT script on the shared connection
         
-        # Generate critical threat rows
-        critical_threat_rows = ""
-        for threat in report_data['critical_threats']:
-            threat_id, threat_type, source, target, detected_at, risk_score = threat
-            detected_time = datetime.fromisoformat(detected_at).strftime('%Y-%m-%d %H:%M')
-            critical_threat_rows += f"""
-                <tr>
-                    <td>{threat_id}</td>
-                    <td>{threat_type.replace('_', ' ').title()}</td>
-                    <td>{source or 'N/A'}</td>
-                    <td>{target or 'N/A'}</td>
-                    <td>{detected_time}</td>
-                    <td>{risk_score}</td>
-                </tr>
-            """
+        A failing statement leaves the script's transaction open, so roll it
+        back before passing the error on.
+        """
+        try:
+            self._conn.executescript(script)
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+    
+    def _has_total_bytes(self, cursor):
+        """Whether network_activity has the generated total_bytes column"""
+        # Once seen the column stays; until then look again, since the
+        # owning component may create the table after this one starts
+        if not self._total_bytes_column:
+            cursor.execute("PRAGMA table_xinfo(network_activity)")
+            self._total_bytes_column = any(row[1] == 'total_bytes' for row in cursor.fetchall())
+        return self._total_bytes_column
+    
+    def _report_stamp(self, name):
+        """Change stamp for a report's tables, or None if it cannot be read"""
+        try:
+            return self._cursor().execute(REPORT_STAMP_SQL[name]).fetchone()
+        except sqlite3.Error as e:
+            self.logger.debug("Report cache bypassed for %s: %s", name, e)
+            return None
+    
+    def close(self):
+        """Close the reporting database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @cached_report('threat_summary')
+    def generate_threat_summary_report(self, days=30, format_type='html'):
+        """Generate threat summary report"""
+        return self._run_report(THREAT_SUMMARY_REPORT, days, format_type)
+    
+    @cached_report('network_activity')
+    def generate_network_activity_report(self, hours=24, format_type='html'):
+        """Generate network activity report"""
+        return self._run_report(NETWORK_ACTIVITY_REPORT, hours, format_type)
+    
+    @cached_report('system_health')
+    def generate_system_health_report(self, hours=24, format_type='html'):
+        """Generate system health report"""
+        return self._run_report(SYSTEM_HEALTH_REPORT, hours, format_type)
+    
+    def _run_report(self, spec, period, format_type):
+        """Query, assemble and render the report a ReportSpec describes"""
+        try:
+            scan = dict(spec.scan_queries) if not self._metrics_rollup else {}
+            if spec.refresh_sql and not scan:
+                # Rollups are written through the shared connection; worker
+                # connections are read-only
+                self._execute_script(spec.refresh_sql)
+            cursor = self._cursor()
+            
+            # Get date range
+            end_time = datetime.now()
+            start_time = end_time - timedelta(**{spec.unit: period})
+            window = (start_time.isoformat(), end_time.isoformat())
+            
+            format_type = format_type.lower()
+            results = {}
+            sum_bytes = None
+            for key, sql, fetch in spec.queries:
+                sql = scan.get(key, sql)
+                if TOTAL_BYTES_SUM in sql:
+                    if sum_bytes is None:
+                        sum_bytes = self._has_total_bytes(cursor)
+                    if not sum_bytes:
+                        sql = sql.replace(TOTAL_BYTES_SUM, TOTAL_BYTES_FALLBACK)
+                if format_type == 'json' and fetch is fetch_all:
+                    cursor.execute(self._json_rows_query(cursor, sql, window), window)
+                    results[key] = RawJSON(cursor.fetchone()[0])
+                    continue
+                cursor.execute(sql, window)
+                results[key] = fetch(cursor)
+            
+            report_data = {
+                'title': spec.title,
+                'period': f'{start_time.strftime(spec.period_format)} to {end_time.strftime(spec.period_format)}',
+                'generated_at': datetime.now().isoformat(),
+            }
+            report_data.update(spec.build(results, period))
+            
+            if format_type == 'html':
+                renderer = spec.html_renderer
+            else:
+                renderer = self.FORMAT_RENDERERS.get(format_type, '_generate_text_report')
+            return getattr(self, renderer)(report_data)
+            
+        except Exception as e:
+            self.logger.error("Failed to generate %s report: %s", spec.name.replace('_', ' '), e)
+            return None
+    
+    def _json_rows_query(self, cursor, sql, window):
+        """JSON_ROWS_SQL around a report query, built from its column names"""
+        query = ReportingSystem._json_rows_queries.get(sql)
+        if query is None:
+            # A LIMIT 0 run is enough for the cursor to describe the columns
+            cursor.execute(f"SELECT * FROM ({sql}) LIMIT 0", window)
+            columns = ", ".join(f'"{column[0]}"' for column in cursor.description)
+            query = JSON_ROWS_SQL.format(columns=columns, query=sql)
+            ReportingSystem._json_rows_queries[sql] = query
+        return query
+    
+    def _generate_html_report(self, report_data):
+        """Generate HTML threat summary report"""
+        # Percentages come precomputed from the query
+        severity_rows = "".join(
+            SEVERITY_ROW.format(escape_html(severity), escape_html(severity.upper()), count, percentage)
+            for severity, count, percentage in report_data['severity_distribution']
+        )
+        threat_type_rows = "".join(
+            THREAT_TYPE_ROW.format(threat_label(threat_type), count, avg_risk)
+            for threat_type, count, avg_risk in report_data['top_threat_types']
+        )
+        critical_threat_rows = "".join(
+            CRITICAL_THREAT_ROW.format(escape_html(threat_id), threat_label(threat_type),
+                                       escape_html(source or 'N/A'), escape_html(target or 'N/A'),
+                                       display_time(detected_at), risk_score)
+            for threat_id, threat_type, source, target, description, detected_at, risk_score
+            in report_data['critical_threats']
+        )
         
         # Fill template
-        html_content = html_template.format(
+        html_content = THREAT_SUMMARY_HTML.substitute(
             title=report_data['title'],
             period=report_data['period'],
             generated_at=datetime.fromisoformat(report_data['generated_at']).strftime('%Y-%m-%d %H:%M:%S'),
@@ -555,7 +926,26 @@ class ReportingSystem:
     
     def _generate_json_report(self, report_data):
         """Generate JSON report"""
-        return json.dumps(report_data, indent=2, default=str)
+        # Sections SQLite already encoded are swapped for placeholders and
+        # spliced back in after the rest of the document is serialized
+        fragments = {}
+        data = {}
+        for key, value in report_data.items():
+            if isinstance(value, RawJSON):
+                placeholder = f"@@json:{key}@@"
+                fragments[f'"{placeholder}"'] = value
+                value = placeholder
+            data[key] = value
+        
+        # Report data holds only strings, numbers, None and row tuples, so
+        # both serializers handle it without a default= fallback
+        if ORJSON_AVAILABLE:
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        else:
+            content = json.dumps(data, indent=2)
+        for placeholder, fragment in fragments.items():
+            content = content.replace(placeholder, fragment, 1)
+        return content
     
     def _generate_text_report(self, report_data):
         """Generate plain text report"""
@@ -577,8 +967,12 @@ class ReportingSystem:
         try:
             output_path = self.output_dir / filename
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            # One encode and one binary write instead of a buffered text stream
+            data = report_content.encode('utf-8')
+            if self.compress_html and filename.endswith('.html') and len(data) > GZIP_MIN_BYTES:
+                output_path = output_path.with_name(output_path.name + '.gz')
+                data = gzip.compress(data, compresslevel=6)
+            output_path.write_bytes(data)
             
             self.logger.info("Report saved to %s", output_path)
             return str(output_path)
@@ -588,10 +982,52 @@ class ReportingSystem:
             return None
     
     def schedule_reports(self):
-        """Schedule automatic report generation"""
-        # This would be implemented with a scheduler like APScheduler
-        # For now, just log the intention
-        self.logger.info("Report scheduling would be implemented here")
+        """Generate and save the scheduled report batch
+        
+        The three reports only read, so they run concurrently, each on its
+        own read-only connection. Returns the saved paths by report name.
+        """
+        # Timing would come from a scheduler like APScheduler; this runs one batch
+        batch = {
+            'threat_summary': (self.generate_threat_summary_report, 30),
+            'network_activity': (self.generate_network_activity_report, 24),
+            'system_health': (self.generate_system_health_report, 24),
+        }
+        readers = []
+        lock = threading.Lock()
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        def open_reader():
+            if self.db_path == ':memory:':
+                return  # Private to the shared connection; use it
+            try:
+                conn = self._connect_read_only()
+            except sqlite3.Error as e:
+                self.logger.warning("Report worker using the shared connection: %s", e)
+                return
+            self._local.conn = conn
+            with lock:
+                readers.append(conn)
+        
+        def generate_and_save(name, generate, period):
+            # Writing in the worker overlaps one report's file I/O with the others' queries
+            report = generate(period, 'html')
+            return self.save_report(report, f"{name}_{stamp}.html") if report else None
+        
+        try:
+            with ThreadPoolExecutor(max_workers=len(batch), thread_name_prefix='ReportWorker',
+                                    initializer=open_reader) as executor:
+                futures = {name: executor.submit(generate_and_save, name, generate, period)
+                           for name, (generate, period) in batch.items()}
+                saved = {name: future.result() for name, future in futures.items()}
+        finally:
+            for conn in readers:
+                conn.close()
+        
+        saved = {name: path for name, path in saved.items() if path}
+        self.logger.info("Scheduled reports generated: %d of %d", len(saved), len(batch))
+        return saved
 
 
 if __name__ == '__main__':
@@ -3,16 +3,312 @@ Security Bot Enterprise - REST API
 Flask-based REST API for system integration and management
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import jwt
 import json
 import logging
 from datetime import datetime
 import sqlite3
-from functools import wraps
-import os
-import tempfile
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from pathlib import Path
+import csv
+import io
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database_integration import POOL_CACHE_SIZE_KIB, POOL_MMAP_SIZE
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+
+# Tables GET /export/<table_name> may dump
+EXPORT_TABLES = frozenset({
+    'threats', 'network_activity', 'file_integrity',
+    'process_activity', 'system_metrics', 'audit_log'
+})
+
+# Routes served to browsers on other origins. Probes and integrations polling
+# /health, /threats and /statistics skip the CORS handling entirely.
+CORS_RESOURCES = {
+    r'/auth/*': {},
+    r'/alerts/*': {},
+}
+
+# Seconds a statistics response is served from cache; the aggregates cover
+# hours to days, so a few seconds of staleness is invisible to pollers
+STATS_CACHE_TTL = 30
+STATS_CACHE_SIZE = 256
+
+# Seconds a verified token is trusted without checking its signature and
+# session again; also capped by the token's own expiry. Logouts through this
+# API drop the token at once, revocations elsewhere apply within the TTL.
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_SIZE = 4096
+
+# Audit events are written by a background thread: at most AUDIT_BATCH_SIZE
+# rows per transaction, flushed after AUDIT_BATCH_WAIT seconds. Events beyond
+# AUDIT_QUEUE_SIZE are dropped rather than blocking the request.
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_BATCH_WAIT = 0.25
+
+# Last hour of system metrics in one pass: average, range and nearest-rank
+# median and 95th percentile per metric. Each metric gets its own ROW_NUMBER
+# ordering, NULLs last (spelled "col IS NULL, col" since NULLS LAST needs
+# SQLite 3.30); the percentile is the value whose rank is ceil(p * n)
+# among the n non-NULL samples.
+SYSTEM_METRICS = (
+    ('cpu', 'cpu_usage'),
+    ('memory', 'memory_usage'),
+    ('disk', 'disk_usage'),
+    ('network_in', 'network_in'),
+    ('network_out', 'network_out'),
+)
+SYSTEM_STATS_SQL = """
+    WITH ranked AS (
+        SELECT {columns}, {ranks}
+        FROM system_metrics
+        WHERE recorded_at >= datetime('now', '-1 hour')
+    )
+    SELECT {aggregates}
+    FROM ranked
+""".format(
+    columns=", ".join(column for _, column in SYSTEM_METRICS),
+    ranks=", ".join(f"ROW_NUMBER() OVER (ORDER BY {column} IS NULL, {column}) AS {name}_rank, "
+                    f"COUNT({column}) OVER () AS {name}_n"
+                    for name, column in SYSTEM_METRICS),
+    aggregates=",\n           ".join(
+        f"AVG({column}) AS avg_{name}, MIN({column}) AS min_{name}, MAX({column}) AS max_{name}, "
+        f"MAX(CASE WHEN {name}_rank = ({name}_n + 1) / 2 THEN {column} END) AS p50_{name}, "
+        f"MAX(CASE WHEN {name}_rank = (95 * {name}_n + 99) / 100 THEN {column} END) AS p95_{name}"
+        for name, column in SYSTEM_METRICS
+    )
+)
+
+# Background tasks (test alerts, cleanup) run on this many threads; finished
+# tasks stay pollable through GET /tasks/<task_id> for TASK_RETENTION seconds
+TASK_WORKERS = 2
+TASK_RETENTION = 3600
+
+# Columns returned per threat by GET /threats, in response field order
+THREAT_LIST_COLUMNS = (
+    'id', 'threat_id', 'threat_type', 'severity', 'source', 'target',
+    'description', 'metadata', 'detected_at', 'resolved_at', 'status', 'risk_score'
+)
+THREAT_LIST_SELECT = "SELECT " + ", ".join(THREAT_LIST_COLUMNS)
+
+# Threats are listed newest first by this key, then by threat_id. A threat
+# without detected_at sorts as '' (after every timestamp) instead of NULL, which
+# the cursor comparison would never match. The threat indexes use the same
+# expression.
+THREAT_SORT_KEY = "COALESCE(detected_at, '')"
+
+
+def _threat_list_sql(by_severity, by_status):
+    """GET /threats statements for a filter combination: (page, seek, count)"""
+    where = " WHERE 1=1"
+    if by_severity:
+        where += " AND severity = ?"
+    if by_status:
+        where += " AND status = ?"
+    order = f" ORDER BY {THREAT_SORT_KEY} DESC, threat_id DESC"
+    return (
+        # The window count gives the total matches of the filter in the same
+        # pass as the page
+        THREAT_LIST_SELECT + ", COUNT(*) OVER () FROM threats" + where + order + " LIMIT ? OFFSET ?",
+        # Seek straight past the previous page's last row instead of stepping
+        # over OFFSET rows; no total is computed. The planner cannot seek an
+        # expression index on the row value alone, so the plain bound on the
+        # sort key is what starts the index range.
+        THREAT_LIST_SELECT + " FROM threats" + where +
+        f" AND {THREAT_SORT_KEY} <= ? AND ({THREAT_SORT_KEY}, threat_id) < (?, ?)" +
+        order + " LIMIT ?",
+        "SELECT COUNT(*) FROM threats" + where
+    )
+
+
+# Every GET /threats statement, keyed by (severity given, status given), so
+# the handler only ever sends these fixed strings to the statement cache
+THREAT_LIST_SQL = {
+    (by_severity, by_status): _threat_list_sql(by_severity, by_status)
+    for by_severity in (False, True)
+    for by_status in (False, True)
+}
+
+AUDIT_INSERT_SQL = """
+    INSERT INTO audit_log
+    (user_id, action, resource, details, ip_address,
+     user_agent, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _json_default(value):
+    """Encode sqlite3.Row results as arrays"""
+    if isinstance(value, sqlite3.Row):
+        return tuple(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(data):
+    """Serialize data to compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def decode_json(data):
+    """Parse JSON text stored in the database"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# (second, ISO timestamp) for current_timestamp; replaced as one tuple so
+# readers on other threads never see a mismatched pair
+_timestamp_cache = (0, '')
+
+
+def current_timestamp():
+    """ISO timestamp of the current second, formatted once per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second).isoformat())
+        _timestamp_cache = cached
+    return cached[1]
+
+
+@lru_cache(maxsize=1)
+def _health_body(timestamp):
+    """Encoded /health payload for a timestamp"""
+    return encode_json({
+        'status': 'healthy',
+        'timestamp': timestamp,
+        'version': '1.0.0'
+    })
+
+
+@lru_cache(maxsize=128)
+def _error_body(message):
+    """Encoded {"error": message} payload, built once per message"""
+    return encode_json({'error': message})
+
+
+def error_response(message, status):
+    """JSON error response with a cached body"""
+    return Response(_error_body(message), status=status, mimetype='application/json')
+
+
+# Pager settings for every pooled connection: the per-connection page cache
+# and mapping sizes DatabaseIntegration uses, and in-memory temp tables for sorts
+CONNECTION_PRAGMAS = (
+    f"PRAGMA cache_size=-{POOL_CACHE_SIZE_KIB}",
+    f"PRAGMA mmap_size={POOL_MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class ConnectionPool:
+    """SQLite connections for the API: one read-write plus a pool of read-only
+    
+    WAL mode lets the read-only connections run alongside the writer, so read
+    endpoints never wait for a status update to commit. Read-only connections
+    are opened on demand up to max_readers and then reused.
+    """
+    
+    def __init__(self, db_path, max_readers=25, timeout=30.0):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.timeout = timeout
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer = queue.Queue(maxsize=1)
+        self._writer.put(self._connect_writer())
+    
+    def _connect_writer(self):
+        """Open the read-write connection in WAL mode"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.timeout,
+                               isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL").fetchone()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma).fetchall()
+        return conn
+    
+    def _connect_reader(self):
+        """Open a read-only connection"""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma).fetchall()
+        return conn
+    
+    def _get_reader(self):
+        """Take an idle reader, open a new one, or wait for one to come back"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                create = True
+            else:
+                create = False
+        if not create:
+            return self._readers.get(timeout=self.timeout)
+        try:
+            return self._connect_reader()
+        except Exception:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise
+    
+    @contextmanager
+    def acquire(self, readonly=True):
+        """Borrow a connection for the duration of a with block"""
+        if readonly:
+            conn = self._get_reader()
+            pool = self._readers
+        else:
+            conn = self._writer.get(timeout=self.timeout)
+            pool = self._writer
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            pool.put(conn)
+    
+    def close(self):
+        """Close every idle connection"""
+        for pool in (self._readers, self._writer):
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
 
 
 class SecurityBotAPI:
@@ -21,16 +317,33 @@ class SecurityBotAPI:
     def __init__(self, auth_system, db_integration, threat_detection, 
                  alerting_system, port=5000):
         self.app = Flask(__name__)
-        CORS(self.app)
+        CORS(self.app, resources=CORS_RESOURCES)
         
         self.auth_system = auth_system
         self.db_integration = db_integration
         self.threat_detection = threat_detection
         self.alerting_system = alerting_system
         self.port = port
+        self.db_pool = ConnectionPool(db_integration.db_path)
+        # Successful verify_token results by token: (expires, result)
+        self._token_cache = {}
+        self._token_cache_lock = threading.Lock()
+        # Encoded statistics responses by (route, window): (expires, body)
+        self._stats_cache = {}
+        self._stats_cache_lock = threading.Lock()
+        # Pending audit events, drained in batches by the writer thread
+        self._audit_queue = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        # Long-running admin work: task_id -> (submitted, future, error message)
+        self._task_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS,
+                                                 thread_name_prefix='APITask')
+        self._tasks = {}
+        self._tasks_lock = threading.Lock()
         
         self.setup_logging()
         self.setup_routes()
+        
+        threading.Thread(target=self._audit_worker, name='APIAuditWriter',
+                         daemon=True).start()
     
     def setup_logging(self):
         """Setup API logging"""
@@ -40,51 +353,236 @@ class SecurityBotAPI:
         logging.getLogger('werkzeug').setLevel(logging.WARNING)
     
     def require_auth(self, permission=None):
-        """Authentication decorator"""
+        """Authentication decorator
+        
+        The wrapper is chosen when the route is decorated, so routes without
+        a permission never reach the permission branch.
+        """
         def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                token = None
-                
-                # Get token from header
-                if 'Authorization' in request.headers:
-                    auth_header = request.headers['Authorization']
-                    if auth_header.startswith('Bearer '):
-                        token = auth_header.split(' ')[1]
-                
-                if not token:
-                    return jsonify({'error': 'Authentication required'}), 401
-                
-                # Verify token
-                auth_result = self.auth_system.verify_token(token)
-                if not auth_result['success']:
-                    return jsonify({'error': auth_result['message']}), 401
-                
-                # Check permission
-                if permission:
-                    if not self.auth_system.check_permission(
-                        auth_result['role'], permission
-                    ):
-                        return jsonify({'error': 'Insufficient permissions'}), 403
-                
-                # Add user info to request
-                request.current_user = auth_result
-                return func(*args, **kwargs)
-            
-            return wrapper
+            if permission:
+                return self._wrap_with_perm(func, permission)
+            return self._wrap_no_perm(func)
         return decorator
     
+    def _wrap_no_perm(self, func):
+        """Wrap a route that only needs a valid token"""
+        verify_token = self._verify_token
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Get token from header
+            auth_header = request.headers.get('Authorization', '')
+            if len(auth_header) <= 7 or not auth_header.startswith('Bearer '):
+                return error_response('Authentication required', 401)
+            
+            auth_result = verify_token(auth_header[7:])
+            if not auth_result['success']:
+                return error_response(auth_result['message'], 401)
+            
+            # Add user info to request
+            request.current_user = auth_result
+            return func(*args, **kwargs)
+        
+        return wrapper
+    
+    def _wrap_with_perm(self, func, permission):
+        """Wrap a route that needs a valid token whose role grants permission"""
+        verify_token = self._verify_token
+        check_permission = self.auth_system.check_permission
+        # Roles seen to hold the permission: role -> expires. check_permission
+        # opens a database connection, so grants are reused for
+        # TOKEN_CACHE_TTL seconds like verified tokens; denials are not cached.
+        granted = {}
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Get token from header
+            auth_header = request.headers.get('Authorization', '')
+            if len(auth_header) <= 7 or not auth_header.startswith('Bearer '):
+                return error_response('Authentication required', 401)
+            
+            auth_result = verify_token(auth_header[7:])
+            if not auth_result['success']:
+                return error_response(auth_result['message'], 401)
+            
+            # Check permission
+            role = auth_result['role']
+            now = time.time()
+            if granted.get(role, 0) <= now:
+                if not check_permission(role, permission):
+                    return error_response('Insufficient permissions', 403)
+                granted[role] = now + TOKEN_CACHE_TTL
+            
+            # Add user info to request
+            request.current_user = auth_result
+            return func(*args, **kwargs)
+        
+        return wrapper
+    
+    def _verify_token(self, token):
+        """verify_token with successful results reused for TOKEN_CACHE_TTL seconds"""
+        now = time.time()
+        with self._token_cache_lock:
+            entry = self._token_cache.get(token)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        
+        auth_result = self.auth_system.verify_token(token)
+        if not auth_result['success']:
+            return auth_result
+        
+        # The signature was just verified, so reading exp unverified is safe
+        try:
+            exp = jwt.decode(token, options={'verify_signature': False})['exp']
+        except (jwt.InvalidTokenError, KeyError):
+            return auth_result  # No expiry to bound the cache entry by
+        expires = min(now + TOKEN_CACHE_TTL, exp)
+        if expires > now:
+            with self._token_cache_lock:
+                if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                    self._token_cache = {k: v for k, v in self._token_cache.items() if v[0] > now}
+                if len(self._token_cache) < TOKEN_CACHE_SIZE:
+                    self._token_cache[token] = (expires, auth_result)
+        return auth_result
+    
+    def _cached_statistics(self, key, compute):
+        """JSON response for a statistics query, reused for STATS_CACHE_TTL seconds"""
+        now = time.monotonic()
+        with self._stats_cache_lock:
+            entry = self._stats_cache.get(key)
+        if entry is not None and entry[0] > now:
+            body = entry[1]
+        else:
+            stats = compute()
+            body = encode_json(stats)
+            # An empty result means the query failed; do not hold on to it
+            if stats:
+                with self._stats_cache_lock:
+                    if len(self._stats_cache) >= STATS_CACHE_SIZE:
+                        self._stats_cache = {k: v for k, v in self._stats_cache.items() if v[0] > now}
+                    if len(self._stats_cache) < STATS_CACHE_SIZE:
+                        self._stats_cache[key] = (now + STATS_CACHE_TTL, body)
+        return Response(body, mimetype='application/json')
+    
+    def _system_statistics(self):
+        """Latest system metrics and the last hour's averages and distribution"""
+        with self.db_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Get latest system metrics
+            cursor.execute("""
+                SELECT * FROM system_metrics 
+                ORDER BY recorded_at DESC 
+                LIMIT 1
+            """)
+            
+            latest_metrics = cursor.fetchone()
+            
+            # Averages, ranges and percentiles for the last hour
+            cursor.execute(SYSTEM_STATS_SQL)
+            hourly = cursor.fetchone()
+        
+        return {
+            'current': dict(latest_metrics) if latest_metrics else {},
+            'hourly_average': {
+                f'avg_{name}': hourly[f'avg_{name}'] for name, _ in SYSTEM_METRICS
+            },
+            'hourly_distribution': {
+                name: {
+                    'min': hourly[f'min_{name}'],
+                    'max': hourly[f'max_{name}'],
+                    'p50': hourly[f'p50_{name}'],
+                    'p95': hourly[f'p95_{name}']
+                }
+                for name, _ in SYSTEM_METRICS
+            }
+        }
+    
+    def _export_csv(self, query, params, batch_size=1000):
+        """Yield a query's CSV text: the header row, then one chunk per batch of rows"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        with self.db_pool.acquire() as conn:
+            cursor = conn.execute(query, params)
+            writer.writerow([description[0] for description in cursor.description])
+            while True:
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                yield chunk
+                
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                writer.writerows(rows)
+    
+    def _submit_task(self, func, error_message):
+        """Run func in the background and answer 202 with a task id to poll"""
+        def run():
+            try:
+                return func()
+            except Exception as e:
+                self.logger.error("%s: %s", error_message, e)
+                raise
+        
+        task_id = secrets.token_hex(16)
+        now = time.monotonic()
+        future = self._task_executor.submit(run)
+        with self._tasks_lock:
+            self._tasks = {
+                key: task for key, task in self._tasks.items()
+                if not task[1].done() or task[0] > now - TASK_RETENTION
+            }
+            self._tasks[task_id] = (now, future, error_message)
+        
+        return Response(encode_json({'task_id': task_id, 'status': 'accepted'}), status=202,
+                        mimetype='application/json', headers={'Location': f'/tasks/{task_id}'})
+    
+    def _log_audit(self, audit_data):
+        """Queue an audit event for the writer thread without blocking the request"""
+        try:
+            self._audit_queue.put_nowait(audit_data)
+        except queue.Full:
+            self.logger.warning("Audit queue full, dropping event: %s", audit_data.get('action'))
+    
+    def _audit_worker(self):
+        """Write queued audit events in batches, one transaction per batch"""
+        while True:
+            batch = [self._audit_queue.get()]
+            deadline = time.monotonic() + AUDIT_BATCH_WAIT
+            while len(batch) < AUDIT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._audit_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            rows = [(
+                audit_data.get('user_id'),
+                audit_data.get('action'),
+                audit_data.get('resource'),
+                audit_data.get('details'),
+                audit_data.get('ip_address'),
+                audit_data.get('user_agent'),
+                audit_data.get('status', 'success')
+            ) for audit_data in batch]
+            try:
+                with self.db_pool.acquire(readonly=False) as conn:
+                    conn.execute("BEGIN")
+                    conn.executemany(AUDIT_INSERT_SQL, rows)
+                    conn.execute("COMMIT")
+            except Exception as e:
+                self.logger.error("Failed to log %d audit events: %s", len(rows), e)
+    
     def setup_routes(self):
         """Setup API routes"""
         
         # Health check
         @self.app.route('/health', methods=['GET'])
         def health_check():
-            return jsonify({
-                'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'version': '1.0.0'
-            })
+            return Response(_health_body(current_timestamp()), mimetype='application/json')
         
         # Authentication endpoints
         @self.app.route('/auth/login', methods=['POST'])
@@ -92,7 +590,7 @@ class SecurityBotAPI:
             data = request.get_json()
             
             if not data or 'username' not in data or 'password' not in data:
-                return jsonify({'error': 'Username and password required'}), 400
+                return error_response('Username and password required', 400)
             
             result = self.auth_system.login(data['username'], data['password'])
             
@@ -102,18 +600,20 @@ class SecurityBotAPI:
                     'user': result['user']
                 })
             else:
-                return jsonify({'error': result['message']}), 401
+                return error_response(result['message'], 401)
         
         @self.app.route('/auth/logout', methods=['POST'])
         @self.require_auth()
         def logout():
-            token = request.headers['Authorization'].split(' ')[1]
+            token = request.headers['Authorization'][7:]
+            with self._token_cache_lock:
+                self._token_cache.pop(token, None)
             result = self.auth_system.logout(token)
             
             if result['success']:
                 return jsonify({'message': 'Logged out successfully'})
             else:
-                return jsonify({'error': result['message']}), 400
+                return error_response(result['message'], 400)
         
         @self.app.route('/auth/user', methods=['GET'])
         @self.require_auth()
@@ -129,91 +629,94 @@ class SecurityBotAPI:
                 limit = min(int(request.args.get('limit', 50)), 100)
                 severity = request.args.get('severity')
                 status = request.args.get('status')
+                # Keyset cursor "<detected_at>,<threat_id>" from next_cursor;
+                # detected_at is empty for a threat without one
+                after = request.args.get('after')
                 
                 offset = (page - 1) * limit
                 
-                # Build query
-                query = "SELECT * FROM threats WHERE 1=1"
-                params = []
-                
-                if severity:
-                    query += " AND severity = ?"
-                    params.append(severity)
+                page_sql, seek_sql, count_sql = THREAT_LIST_SQL[bool(severity), bool(status)]
+                params = [value for value in (severity, status) if value]
                 
-                if status:
-                    query += " AND status = ?"
-                    params.append(status)
-                
-                query += " ORDER BY detected_at DESC LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+                if after:
+                    if ',' not in after:
+                        return error_response('Invalid cursor', 400)
+                    after_ts, after_id = after.split(',', 1)
+                    query = seek_sql
+                    query_params = params + [after_ts, after_ts, after_id, limit]
+                else:
+                    query = page_sql
+                    query_params = params + [limit, offset]
                 
                 # Execute query
-                conn = self.db_integration.get_connection()
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                
-                threats = []
-                for row in cursor.fetchall():
-                    threat = dict(row)
-                    if threat['metadata']:
-                        threat['metadata'] = json.loads(threat['metadata'])
-                    threats.append(threat)
-                
-                # Get total count
-                count_query = "SELECT COUNT(*) FROM threats WHERE 1=1"
-                count_params = []
-                
-                if severity:
-                    count_query += " AND severity = ?"
-                    count_params.append(severity)
-                
-                if status:
-                    count_query += " AND status = ?"
-                    count_params.append(status)
-                
-                cursor.execute(count_query, count_params)
-                total = cursor.fetchone()[0]
-                
-                self.db_integration.return_connection(conn)
-                
-                return jsonify({
-                    'threats': threats,
-                    'pagination': {
+                with self.db_pool.acquire() as conn:
+                    # Plain tuples: the row is zipped with the column names
+                    # once, without building a sqlite3.Row first
+                    cursor = conn.cursor()
+                    cursor.row_factory = None
+                    cursor.arraysize = limit
+                    cursor.execute(query, query_params)
+                    
+                    threats = []
+                    total = 0
+                    while rows := cursor.fetchmany():
+                        if not after:
+                            total = rows[0][-1]
+                        for row in rows:
+                            threat = dict(zip(THREAT_LIST_COLUMNS, row))
+                            if threat['metadata']:
+                                threat['metadata'] = decode_json(threat['metadata'])
+                            threats.append(threat)
+                    
+                    if not threats and offset and not after:
+                        # Past the last page there is no row to carry the total
+                        cursor.execute(count_sql, params)
+                        total = cursor.fetchone()[0]
+                
+                next_cursor = None
+                if len(threats) == limit:
+                    last = threats[-1]
+                    next_cursor = f"{last['detected_at'] or ''},{last['threat_id']}"
+                
+                if after:
+                    pagination = {'limit': limit, 'next_cursor': next_cursor}
+                else:
+                    pagination = {
                         'page': page,
                         'limit': limit,
                         'total': total,
-                        'pages': (total + limit - 1) // limit
+                        'pages': (total + limit - 1) // limit,
+                        'next_cursor': next_cursor
                     }
-                })
+                
+                return Response(encode_json({
+                    'threats': threats,
+                    'pagination': pagination
+                }), mimetype='application/json')
                 
             except Exception as e:
                 self.logger.error("Failed to get threats: %s", e)
-                return jsonify({'error': 'Failed to retrieve threats'}), 500
+                return error_response('Failed to retrieve threats', 500)
         
         @self.app.route('/threats/<threat_id>', methods=['GET'])
         @self.require_auth('read')
         def get_threat(threat_id):
             try:
-                conn = self.db_integration.get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT * FROM threats WHERE threat_id = ?", (threat_id,))
-                row = cursor.fetchone()
+                with self.db_pool.acquire() as conn:
+                    row = conn.execute("SELECT * FROM threats WHERE threat_id = ?", (threat_id,)).fetchone()
                 
                 if not row:
-                    return jsonify({'error': 'Threat not found'}), 404
+                    return error_response('Threat not found', 404)
                 
                 threat = dict(row)
                 if threat['metadata']:
-                    threat['metadata'] = json.loads(threat['metadata'])
-                
-                self.db_integration.return_connection(conn)
+                    threat['metadata'] = decode_json(threat['metadata'])
                 
-                return jsonify(threat)
+                return Response(encode_json(threat), mimetype='application/json')
                 
             except Exception as e:
                 self.logger.error("Failed to get threat: %s", e)
-                return jsonify({'error': 'Failed to retrieve threat'}), 500
+                return error_response('Failed to retrieve threat', 500)
         
         @self.app.route('/threats/<threat_id>/status', methods=['PUT'])
         @self.require_auth('write')
@@ -221,29 +724,25 @@ class SecurityBotAPI:
             try:
                 data = request.get_json()
                 if 'status' not in data:
-                    return jsonify({'error': 'Status required'}), 400
-                
-                conn = self.db_integration.get_connection()
-                cursor = conn.cursor()
-                
-                # Update threat status
-                cursor.execute("""
-                    UPDATE threats 
-                    SET status = ?, resolved_at = CASE 
-                        WHEN ? = 'resolved' THEN CURRENT_TIMESTAMP 
-                        ELSE resolved_at 
-                    END
-                    WHERE threat_id = ?
-                """, (data['status'], data['status'], threat_id))
+                    return error_response('Status required', 400)
+                
+                # Update threat status; the writer connection is in autocommit
+                # mode, so the single UPDATE commits on its own
+                with self.db_pool.acquire(readonly=False) as conn:
+                    cursor = conn.execute("""
+                        UPDATE threats 
+                        SET status = ?, resolved_at = CASE 
+                            WHEN ? = 'resolved' THEN CURRENT_TIMESTAMP 
+                            ELSE resolved_at 
+                        END
+                        WHERE threat_id = ?
+                    """, (data['status'], data['status'], threat_id))
                 
                 if cursor.rowcount == 0:
-                    return jsonify({'error': 'Threat not found'}), 404
-                
-                conn.commit()
-                self.db_integration.return_connection(conn)
+                    return error_response('Threat not found', 404)
                 
                 # Log audit event
-                self.db_integration.log_audit_event({
+                self._log_audit({
                     'user_id': request.current_user['username'],
                     'action': 'update_threat_status',
                     'resource': f'threat/{threat_id}',
@@ -255,7 +754,7 @@ class SecurityBotAPI:
                 
             except Exception as e:
                 self.logger.error("Failed to update threat status: %s", e)
-                return jsonify({'error': 'Failed to update threat status'}), 500
+                return error_response('Failed to update threat status', 500)
         
         # Statistics endpoints
         @self.app.route('/statistics/threats', methods=['GET'])
@@ -263,65 +762,36 @@ class SecurityBotAPI:
         def get_threat_statistics():
             try:
                 days = int(request.args.get('days', 30))
-                stats = self.db_integration.get_threat_statistics(days)
-                return jsonify(stats)
+                return self._cached_statistics(
+                    ('threats', days), lambda: self.db_integration.get_threat_statistics(days)
+                )
                 
             except Exception as e:
                 self.logger.error("Failed to get threat statistics: %s", e)
-                return jsonify({'error': 'Failed to retrieve statistics'}), 500
+                return error_response('Failed to retrieve statistics', 500)
         
         @self.app.route('/statistics/network', methods=['GET'])
         @self.require_auth('read')
         def get_network_statistics():
             try:
                 hours = int(request.args.get('hours', 24))
-                stats = self.db_integration.get_network_statistics(hours)
-                return jsonify(stats)
+                return self._cached_statistics(
+                    ('network', hours), lambda: self.db_integration.get_network_statistics(hours)
+                )
                 
             except Exception as e:
                 self.logger.error("Failed to get network statistics: %s", e)
-                return jsonify({'error': 'Failed to retrieve statistics'}), 500
+                return error_response('Failed to retrieve statistics', 500)
         
         @self.app.route('/statistics/system', methods=['GET'])
         @self.require_auth('read')
         def get_system_statistics():
             try:
-                # Get latest system metrics
-                conn = self.db_integration.get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT * FROM system_metrics 
-                    ORDER BY recorded_at DESC 
-                    LIMIT 1
-                """)
-                
-                latest_metrics = cursor.fetchone()
-                
-                # Get average metrics for the last hour
-                cursor.execute("""
-                    SELECT 
-                        AVG(cpu_usage) as avg_cpu,
-                        AVG(memory_usage) as avg_memory,
-                        AVG(disk_usage) as avg_disk,
-                        AVG(network_in) as avg_network_in,
-                        AVG(network_out) as avg_network_out
-                    FROM system_metrics 
-                    WHERE recorded_at >= datetime('now', '-1 hour')
-                """)
-                
-                avg_metrics = cursor.fetchone()
-                
-                self.db_integration.return_connection(conn)
-                
-                return jsonify({
-                    'current': dict(latest_metrics) if latest_metrics else {},
-                    'hourly_average': dict(avg_metrics) if avg_metrics else {}
-                })
+                return self._cached_statistics(('system',), self._system_statistics)
                 
             except Exception as e:
                 self.logger.error("Failed to get system statistics: %s", e)
-                return jsonify({'error': 'Failed to retrieve statistics'}), 500
+                return error_response('Failed to retrieve statistics', 500)
         
         # Alerting endpoints
         @self.app.route('/alerts', methods=['POST'])
@@ -332,7 +802,7 @@ class SecurityBotAPI:
                 
                 required_fields = ['alert_id', 'severity', 'title', 'message']
                 if not all(field in data for field in required_fields):
-                    return jsonify({'error': 'Missing required fields'}), 400
+                    return error_response('Missing required fields', 400)
                 
                 self.alerting_system.create_alert(
                     data['alert_id'],
@@ -346,18 +816,16 @@ class SecurityBotAPI:
                 
             except Exception as e:
                 self.logger.error("Failed to create alert: %s", e)
-                return jsonify({'error': 'Failed to create alert'}), 500
+                return error_response('Failed to create alert', 500)
         
         @self.app.route('/alerts/test', methods=['POST'])
         @self.require_auth('admin')
         def test_alerts():
-            try:
+            def send():
                 self.alerting_system.test_channels()
-                return jsonify({'message': 'Test alerts sent'})
-                
-            except Exception as e:
-                self.logger.error("Failed to send test alerts: %s", e)
-                return jsonify({'error': 'Failed to send test alerts'}), 500
+                return {'message': 'Test alerts sent'}
+            
+            return self._submit_task(send, 'Failed to send test alerts')
         
         # Export endpoints
         @self.app.route('/export/<table_name>', methods=['GET'])
@@ -365,49 +833,45 @@ class SecurityBotAPI:
         def export_data(table_name):
             try:
                 # Validate table name
-                valid_tables = [
-                    'threats', 'network_activity', 'file_integrity',
-                    'process_activity', 'system_metrics', 'audit_log'
-                ]
-                
-                if table_name not in valid_tables:
-                    return jsonify({'error': 'Invalid table name'}), 400
+                if table_name not in EXPORT_TABLES:
+                    return error_response('Invalid table name', 400)
                 
                 # Get date parameters
                 date_from = request.args.get('date_from')
                 date_to = request.args.get('date_to')
                 
-                # Create temporary file
-                temp_file = tempfile.NamedTemporaryFile(
-                    mode='w', 
-                    suffix='.csv', 
-                    delete=False
-                )
-                temp_file.close()
-                
-                # Export data
-                success = self.db_integration.export_data(
+                query, params = self.db_integration.build_export_query(
                     table_name, 
-                    temp_file.name, 
                     date_from, 
                     date_to
                 )
                 
-                if not success:
-                    os.unlink(temp_file.name)
-                    return jsonify({'error': 'Export failed'}), 500
-                
-                # Return file
-                return send_file(
-                    temp_file.name,
-                    as_attachment=True,
-                    download_name=f'{table_name}_export.csv',
-                    mimetype='text/csv'
+                # Stream the CSV as it is read; taking the header runs the
+                # query, so a failing export still gets an error response
+                chunks = self._export_csv(query, params)
+                header = next(chunks)
+                
+                # A generator, unlike itertools.chain, has close(): the server
+                # calls it when the client goes away, which closes chunks and
+                # returns its pooled connection right away
+                def body():
+                    try:
+                        yield header
+                        yield from chunks
+                    finally:
+                        chunks.close()
+                
+                return Response(
+                    body(),
+                    mimetype='text/csv',
+                    headers={
+                        'Content-Disposition': f'attachment; filename={table_name}_export.csv'
+                    }
                 )
                 
             except Exception as e:
                 self.logger.error("Failed to export data: %s", e)
-                return jsonify({'error': 'Export failed'}), 500
+                return error_response('Export failed', 500)
         
         # System management endpoints
         @self.app.route('/system/info', methods=['GET'])
@@ -419,12 +883,12 @@ class SecurityBotAPI:
                 return jsonify({
                     'database': db_info,
                     'api_version': '1.0.0',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': current_timestamp()
                 })
                 
             except Exception as e:
                 self.logger.error("Failed to get system info: %s", e)
-                return jsonify({'error': 'Failed to retrieve system info'}), 500
+                return error_response('Failed to retrieve system info', 500)
         
         @self.app.route('/system/cleanup', methods=['POST'])
         @self.require_auth('admin')
@@ -432,39 +896,90 @@ class SecurityBotAPI:
             try:
                 data = request.get_json() or {}
                 days_to_keep = data.get('days_to_keep', 90)
+                # Request details are gone by the time the task runs
+                user_id = request.current_user['username']
+                ip_address = request.remote_addr
                 
+            except Exception as e:
+                self.logger.error("Failed to cleanup database: %s", e)
+                return error_response('Database cleanup failed', 500)
+            
+            def cleanup():
                 deleted_records = self.db_integration.cleanup_old_data(days_to_keep)
                 
                 # Log audit event
-                self.db_integration.log_audit_event({
-                    'user_id': request.current_user['username'],
+                self._log_audit({
+                    'user_id': user_id,
                     'action': 'database_cleanup',
                     'resource': 'system',
                     'details': f"Cleaned up {deleted_records} old records",
-                    'ip_address': request.remote_addr
-                })
-                
-                return jsonify({
-                    'message': f'Cleaned up {deleted_records} old records'
+                    'ip_address': ip_address
                 })
                 
-            except Exception as e:
-                self.logger.error("Failed to cleanup database: %s", e)
-                return jsonify({'error': 'Database cleanup failed'}), 500
+                return {'message': f'Cleaned up {deleted_records} old records'}
+            
+            return self._submit_task(cleanup, 'Database cleanup failed')
+        
+        @self.app.route('/tasks/<task_id>', methods=['GET'])
+        @self.require_auth('admin')
+        def get_task(task_id):
+            with self._tasks_lock:
+                task = self._tasks.get(task_id)
+            if task is None:
+                return error_response('Task not found', 404)
+            
+            _, future, error_message = task
+            if not future.done():
+                status = 'running' if future.running() else 'pending'
+                return jsonify({'task_id': task_id, 'status': status})
+            if future.exception() is not None:
+                return jsonify({'task_id': task_id, 'status': 'failed', 'error': error_message})
+            return jsonify({'task_id': task_id, 'status': 'completed', 'result': future.result()})
         
         # Error handlers
         @self.app.errorhandler(404)
         def not_found(error):
-            return jsonify({'error': 'Endpoint not found'}), 404
+            return error_response('Endpoint not found', 404)
         
         @self.app.errorhandler(500)
         def internal_error(error):
-            return jsonify({'error': 'Internal server error'}), 500
+            return error_response('Internal server error', 500)
     
-    def run(self, debug=False):
-        """Run the API server"""
+    def run(self, debug=False, threads=16):
+        """Run the API server
+        
+        Serves with waitress's thread pool when it is installed, otherwise
+        with Werkzeug's threaded server. For several worker processes, point
+        a WSGI server at create_app(), e.g.
+        gunicorn -w 4 -k gthread --threads 16 'rest_api:create_app()'
+        
+        Waitress reads requests and writes responses on its own event loop,
+        so slow clients do not hold a worker thread; the threads only run the
+        handlers, which mostly wait on SQLite. The reader pool is sized to the
+        thread count so a handler never queues for a connection.
+        """
+        self.db_pool.max_readers = max(self.db_pool.max_readers, threads)
         self.logger.info("Starting Security Bot API on port %d", self.port)
-        self.app.run(host='0.0.0.0', port=self.port, debug=debug)
+        if WAITRESS_AVAILABLE and not debug:
+            waitress.serve(self.app, host='0.0.0.0', port=self.port, threads=threads)
+        else:
+            self.app.run(host='0.0.0.0', port=self.port, debug=debug, threaded=True)
+
+
+def create_app(db_path="security_bot.db"):
+    """Build the API and its components and return the WSGI application"""
+    from auth_system import AuthenticationSystem
+    from database_integration import DatabaseIntegration
+    from threat_detection import ThreatDetectionEngine
+    from alerting_system import AlertingSystem
+    
+    api = SecurityBotAPI(
+        AuthenticationSystem(db_path),
+        DatabaseIntegration(db_path),
+        ThreatDetectionEngine(db_path),
+        AlertingSystem(db_path=db_path)
+    )
+    return api.app
 
 
 if __name__ == '__main__':
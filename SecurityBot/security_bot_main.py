@@ -5,30 +5,178 @@ Orchestrates all enterprise security components with proper initialization and c
 
 import os
 import sys
+import copy
+import functools
+import hashlib
+import importlib
 import logging
+import logging.handlers
+import pickle
+import queue
 import threading
 import time
 import signal
+import stat
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Add current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import all enterprise components
-try:
-    from threat_detection import ThreatDetectionEngine
-    from auth_system import AuthenticationManager
-    from enhanced_dashboard import EnhancedDashboard
-    from alerting_system import AlertingSystem
-    from database_integration import DatabaseManager
-    from rest_api import SecurityBotAPI
-    from ui_ux_manager import UIUXManager
-    from reporting_system import ReportingSystem
-except ImportError as e:
-    print(f"Warning: Some modules could not be imported: {e}")
-    print("Some features may not be available until all dependencies are installed.")
+
+# Component modules are imported only when the component is enabled, so a
+# disabled one costs nothing at startup and a missing dependency only takes
+# down the component that needs it
+def component_class(module_name, class_name):
+    """Import a component's module on first use and return its class"""
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+# Log file, rolled over to .1 ... .14 once it reaches 64 MB
+LOG_FILE = 'logs/security_bot.log'
+LOG_MAX_BYTES = 64 * 1024 * 1024
+LOG_BACKUP_COUNT = 14
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that formats each second's timestamp only once"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted time), replaced as one tuple across threads
+        self._cached_time = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached = self._cached_time
+        if cached[0] != second:
+            formatted = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            cached = self._cached_time = (second, formatted)
+        return cached[1]
+
+
+# Settings used when config.json leaves them out, or when it is missing
+DEFAULT_CONFIG = {
+    "enterprise": {
+        "company_name": "Security Bot Enterprise",
+        "version": "1.0.0",
+        "environment": "production",
+        "debug": False
+    },
+    "components": {
+        "threat_detection": {
+            "enabled": True,
+            "scan_interval": 30,
+            "real_time_monitoring": True
+        },
+        "authentication": {
+            "enabled": True,
+            "session_timeout": 3600,
+            "max_login_attempts": 5
+        },
+        "dashboard": {
+            "enabled": True,
+            "port": 8080,
+            "auto_refresh": True,
+            "refresh_interval": 30
+        },
+        "alerting": {
+            "enabled": True,
+            "email_notifications": True,
+            "sms_notifications": False,
+            "webhook_notifications": True
+        },
+        "database": {
+            "enabled": True,
+            "backup_enabled": True,
+            "backup_interval": 24,
+            "retention_days": 90
+        },
+        "api": {
+            "enabled": True,
+            "port": 8081,
+            "rate_limiting": True,
+            "cors_enabled": True
+        },
+        "reporting": {
+            "enabled": True,
+            "daily_reports": True,
+            "weekly_reports": True,
+            "monthly_compliance": True
+        }
+    },
+    "security": {
+        "api_keys": [],
+        "jwt_secret": "change-this-in-production",
+        "encryption_key": "change-this-in-production"
+    },
+    "network": {
+        "bind_address": "0.0.0.0",
+        "dashboard_port": 8080,
+        "api_port": 8081
+    }
+}
+
+# Components in construction order: (name in self.components, section of
+# config['components'] whose "enabled" flag gates it or None for always on,
+# label for the log, module, class, factory taking the class and the config).
+# The database comes first because the other components depend on it.
+COMPONENT_SPECS = (
+    ('database', 'database', "Database manager",
+     'database_integration', 'DatabaseIntegration', lambda cls, config: cls()),
+    ('auth', 'authentication', "Authentication system",
+     'auth_system', 'AuthenticationSystem', lambda cls, config: cls()),
+    ('threat_detection', 'threat_detection', "Threat detection engine",
+     'threat_detection', 'ThreatDetectionEngine', lambda cls, config: cls()),
+    ('alerting', 'alerting', "Alerting system",
+     'alerting_system', 'AlertingSystem', lambda cls, config: cls()),
+    ('dashboard', 'dashboard', "Enhanced dashboard",
+     'enhanced_dashboard', 'EnhancedDashboard',
+     lambda cls, config: cls(port=config['network']['dashboard_port'])),
+    ('api', 'api', "REST API",
+     'rest_api', 'SecurityBotAPI',
+     lambda cls, config: cls(port=config['network']['api_port'])),
+    ('ui_ux', None, "UI/UX manager",
+     'ui_ux_manager', 'UIUXManager', lambda cls, config: cls()),
+    ('reporting', 'reporting', "Reporting system",
+     'reporting_system', 'ReportingSystem', lambda cls, config: cls()),
+)
+
+# Components whose constructors create or migrate tables in the shared
+# database. They are built one at a time in table order, so no two run DDL
+# against the database at once.
+SCHEMA_COMPONENTS = frozenset(
+    ('database', 'auth', 'threat_detection', 'alerting', 'dashboard', 'reporting')
+)
+
+# Long-running component loops started by start_component_threads:
+# (component name, method that runs or starts its loop, thread label for the log)
+COMPONENT_RUNNERS = (
+    ('threat_detection', 'start_monitoring', "Threat detection thread"),
+    ('alerting', 'start_processor', "Alerting thread"),
+    ('dashboard', 'start_server', "Dashboard server thread"),
+    ('api', 'run', "REST API server thread"),
+    ('reporting', 'schedule_reports', "Reporting scheduler thread"),
+)
+
+# Seconds between health_check calls on components that cannot report
+# their own health changes
+HEALTH_POLL_INTERVAL = 60
+
+# Seconds the main thread blocks between stop checks. POSIX runs signal
+# handlers during an untimed wait; Windows only delivers Ctrl+C once the
+# wait returns, so it wakes every second there.
+MAIN_LOOP_WAIT = 1.0 if os.name == 'nt' else None
+
+# Parsed config.json is pickled next to it under this suffix, keyed by the
+# file's mtime, size and digest, so unchanged configs skip JSON parsing.
+# Unpickling runs code, so the cache is only read if it belongs to the current
+# user and nobody else can write it; where ownership cannot be checked
+# (Windows) it is not used at all.
+CONFIG_CACHE_SUFFIX = ".cache.pkl"
+CONFIG_CACHE_ENABLED = hasattr(os, 'getuid')
 
 
 class SecurityBotEnterprise:
@@ -39,6 +187,12 @@ class SecurityBotEnterprise:
         self.running = False
         self.components = {}
         self.threads = []
+        # Set by stop(); the main loop sleeps on it
+        self._stop_event = threading.Event()
+        # Component health: state changes queued by listeners for the current
+        # monitor run (None until monitoring starts), latest states
+        self._health_queue = None
+        self._health = {}
         
         # Setup logging
         self.setup_logging()
@@ -59,95 +213,92 @@ class SecurityBotEnterprise:
         # Create logs directory
         os.makedirs("logs", exist_ok=True)
         
-        # Configure root logger
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'logs/security_bot_{datetime.now().strftime("%Y%m%d")}.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        # One formatter for both handlers, so each second is formatted once
+        formatter = CachedTimeFormatter(
+            '{asctime} - {name} - {levelname} - {message}',
+            datefmt='%Y-%m-%dT%H:%M:%S',
+            style='{'
         )
+        handlers = [
+            logging.handlers.RotatingFileHandler(
+                LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                encoding='utf-8'
+            ),
+            logging.StreamHandler(sys.stdout)
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Configure root logger
+        logging.basicConfig(level=logging.INFO, handlers=handlers)
         
         self.logger = logging.getLogger('SecurityBotEnterprise')
         self.logger.info("Logging system initialized")
     
     def load_configuration(self):
         """Load enterprise configuration"""
-        default_config = {
-            "enterprise": {
-                "company_name": "Security Bot Enterprise",
-                "version": "1.0.0",
-                "environment": "production",
-                "debug": False
-            },
-            "components": {
-                "threat_detection": {
-                    "enabled": True,
-                    "scan_interval": 30,
-                    "real_time_monitoring": True
-                },
-                "authentication": {
-                    "enabled": True,
-                    "session_timeout": 3600,
-                    "max_login_attempts": 5
-                },
-                "dashboard": {
-                    "enabled": True,
-                    "port": 8080,
-                    "auto_refresh": True,
-                    "refresh_interval": 30
-                },
-                "alerting": {
-                    "enabled": True,
-                    "email_notifications": True,
-                    "sms_notifications": False,
-                    "webhook_notifications": True
-                },
-                "database": {
-                    "enabled": True,
-                    "backup_enabled": True,
-                    "backup_interval": 24,
-                    "retention_days": 90
-                },
-                "api": {
-                    "enabled": True,
-                    "port": 8081,
-                    "rate_limiting": True,
-                    "cors_enabled": True
-                },
-                "reporting": {
-                    "enabled": True,
-                    "daily_reports": True,
-                    "weekly_reports": True,
-                    "monthly_compliance": True
-                }
-            },
-            "security": {
-                "api_keys": [],
-                "jwt_secret": "change-this-in-production",
-                "encryption_key": "change-this-in-production"
-            },
-            "network": {
-                "bind_address": "0.0.0.0",
-                "dashboard_port": 8080,
-                "api_port": 8081
-            }
-        }
-        
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    saved_config = json.load(f)
-                    # Merge with defaults
-                    self.config = {**default_config, **saved_config}
+                saved_config = self.read_saved_configuration()
+                # Merge with defaults, section by section
+                self.config = self._deep_merge(copy.deepcopy(DEFAULT_CONFIG), saved_config)
             else:
-                self.config = default_config
+                self.config = copy.deepcopy(DEFAULT_CONFIG)
                 self.save_configuration()
                 
         except Exception as e:
             self.logger.error("Failed to load configuration: %s", e)
-            self.config = default_config
+            self.config = copy.deepcopy(DEFAULT_CONFIG)
+    
+    @staticmethod
+    def _deep_merge(base, overlay):
+        """Merge overlay into base, recursing where both sides hold a dict"""
+        for key, value in overlay.items():
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                SecurityBotEnterprise._deep_merge(base[key], value)
+            else:
+                base[key] = value
+        return base
+    
+    def read_saved_configuration(self):
+        """Parse the config file, reusing the cached parse while it is unchanged"""
+        file_stat = os.stat(self.config_file)
+        with open(self.config_file, 'rb') as f:
+            data = f.read()
+        if not CONFIG_CACHE_ENABLED:
+            return json.loads(data)
+        key = (file_stat.st_mtime_ns, file_stat.st_size,
+               hashlib.blake2b(data, digest_size=16).digest())
+        cache_file = self.config_file + CONFIG_CACHE_SUFFIX
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                cache_stat = os.fstat(f.fileno())
+                if (cache_stat.st_uid != os.getuid()
+                        or cache_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)):
+                    raise PermissionError("not owned by this user or writable by others")
+                cached = pickle.load(f)
+            if cached['key'] == key:
+                return cached['config']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable configuration cache: %s", e)
+        
+        saved_config = json.loads(data)
+        
+        # Write the cache atomically so a concurrent start never reads half,
+        # readable and writable by this user only
+        try:
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'key': key, 'config': saved_config}, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            self.logger.warning("Failed to cache configuration: %s", e)
+        
+        return saved_config
     
     def save_configuration(self):
         """Save current configuration"""
@@ -163,74 +314,62 @@ class SecurityBotEnterprise:
         """Initialize all enterprise components"""
         self.logger.info("Initializing enterprise components...")
         
-        # Initialize database first (required by other components)
-        if self.config['components']['database']['enabled']:
-            try:
-                self.components['database'] = DatabaseManager()
-                self.logger.info("Database manager initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize database: %s", e)
-        
-        # Initialize authentication system
-        if self.config['components']['authentication']['enabled']:
-            try:
-                self.components['auth'] = AuthenticationManager()
-                self.logger.info("Authentication system initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize authentication: %s", e)
-        
-        # Initialize threat detection engine
-        if self.config['components']['threat_detection']['enabled']:
-            try:
-                self.components['threat_detection'] = ThreatDetectionEngine()
-                self.logger.info("Threat detection engine initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize threat detection: %s", e)
-        
-        # Initialize alerting system
-        if self.config['components']['alerting']['enabled']:
-            try:
-                self.components['alerting'] = AlertingSystem()
-                self.logger.info("Alerting system initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize alerting system: %s", e)
-        
-        # Initialize dashboard
-        if self.config['components']['dashboard']['enabled']:
-            try:
-                self.components['dashboard'] = EnhancedDashboard(
-                    port=self.config['network']['dashboard_port']
-                )
-                self.logger.info("Enhanced dashboard initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize dashboard: %s", e)
+        specs = [
+            spec for spec in COMPONENT_SPECS
+            if not spec[1] or self.config['components'][spec[1]]['enabled']
+        ]
+        
+        with ThreadPoolExecutor(max_workers=len(specs),
+                                thread_name_prefix='ComponentInit') as executor:
+            # Importing the modules touches no database, so all of them load
+            # side by side
+            classes = list(executor.map(self._load_component_class, specs))
+            built = {}
+            
+            # Database first (required by the other components), then every
+            # other component that sets up tables, one at a time
+            for spec, cls in zip(specs, classes):
+                if spec[0] in SCHEMA_COMPONENTS:
+                    built[spec[0]] = self._build_component(spec, cls)
+            
+            # The rest only need the finished schema, so they are built side
+            # by side
+            futures = {
+                spec[0]: executor.submit(self._build_component, spec, cls)
+                for spec, cls in zip(specs, classes)
+                if spec[0] not in SCHEMA_COMPONENTS
+            }
+            for name, future in futures.items():
+                built[name] = future.result()
         
-        # Initialize REST API
-        if self.config['components']['api']['enabled']:
-            try:
-                self.components['api'] = SecurityBotAPI(
-                    port=self.config['network']['api_port']
-                )
-                self.logger.info("REST API initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize REST API: %s", e)
+        # Results are added in table order
+        for spec in specs:
+            if built[spec[0]] is not None:
+                self.components[spec[0]] = built[spec[0]]
         
-        # Initialize UI/UX manager
+        self.logger.info("All components initialized successfully")
+    
+    def _load_component_class(self, spec):
+        """Import a component's class, or log the failure and return None"""
+        label, module_name, class_name = spec[2:5]
         try:
-            self.components['ui_ux'] = UIUXManager()
-            self.logger.info("UI/UX manager initialized")
+            return component_class(module_name, class_name)
         except Exception as e:
-            self.logger.error("Failed to initialize UI/UX manager: %s", e)
-        
-        # Initialize reporting system
-        if self.config['components']['reporting']['enabled']:
-            try:
-                self.components['reporting'] = ReportingSystem()
-                self.logger.info("Reporting system initialized")
-            except Exception as e:
-                self.logger.error("Failed to initialize reporting system: %s", e)
-        
-        self.logger.info("All components initialized successfully")
+            self.logger.error("Failed to initialize %s: %s", label, e)
+            return None
+    
+    def _build_component(self, spec, cls):
+        """Construct one component, or log the failure and return None"""
+        label, factory = spec[2], spec[5]
+        if cls is None:
+            return None
+        try:
+            component = factory(cls, self.config)
+            self.logger.info("%s initialized", label)
+            return component
+        except Exception as e:
+            self.logger.error("Failed to initialize %s: %s", label, e)
+            return None
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
@@ -245,70 +384,24 @@ class SecurityBotEnterprise:
         """Start all component threads"""
         self.logger.info("Starting component threads...")
         
-        # Start threat detection engine
-        if 'threat_detection' in self.components:
-            def run_threat_detection():
-                try:
-                    self.components['threat_detection'].start_monitoring()
-                except Exception as e:
-                    self.logger.error("Threat detection thread error: %s", e)
-            
-            thread = threading.Thread(target=run_threat_detection, daemon=True)
-            thread.start()
-            self.threads.append(thread)
-            self.logger.info("Threat detection thread started")
-        
-        # Start alerting system
-        if 'alerting' in self.components:
-            def run_alerting():
-                try:
-                    self.components['alerting'].start_alert_processing()
-                except Exception as e:
-                    self.logger.error("Alerting thread error: %s", e)
-            
-            thread = threading.Thread(target=run_alerting, daemon=True)
-            thread.start()
-            self.threads.append(thread)
-            self.logger.info("Alerting thread started")
-        
-        # Start dashboard server
-        if 'dashboard' in self.components:
-            def run_dashboard():
-                try:
-                    self.components['dashboard'].start_server()
-                except Exception as e:
-                    self.logger.error("Dashboard thread error: %s", e)
-            
-            thread = threading.Thread(target=run_dashboard, daemon=True)
-            thread.start()
-            self.threads.append(thread)
-            self.logger.info("Dashboard server thread started")
-        
-        # Start REST API server
-        if 'api' in self.components:
-            def run_api():
-                try:
-                    self.components['api'].start_server()
-                except Exception as e:
-                    self.logger.error("API thread error: %s", e)
-            
-            thread = threading.Thread(target=run_api, daemon=True)
-            thread.start()
-            self.threads.append(thread)
-            self.logger.info("REST API server thread started")
-        
-        # Start reporting scheduler
-        if 'reporting' in self.components:
-            def run_reporting():
-                try:
-                    self.components['reporting'].start_scheduler()
-                except Exception as e:
-                    self.logger.error("Reporting thread error: %s", e)
-            
-            thread = threading.Thread(target=run_reporting, daemon=True)
-            thread.start()
-            self.threads.append(thread)
-            self.logger.info("Reporting scheduler thread started")
+        for name, method_name, label in COMPONENT_RUNNERS:
+            if name in self.components:
+                self._launch(name, method_name, label)
+    
+    def _launch(self, name, method_name, label):
+        """Run a component's blocking method on its own named daemon thread"""
+        thread = threading.Thread(target=self._run_component, args=(name, method_name, label),
+                                  daemon=True, name=f"sb-{name}")
+        thread.start()
+        self.threads.append(thread)
+        self.logger.info("%s started", label)
+    
+    def _run_component(self, name, method_name, label):
+        """Thread target: call the component method and log anything it raises"""
+        try:
+            getattr(self.components[name], method_name)()
+        except Exception as e:
+            self.logger.error("%s error: %s", label, e)
     
     def start(self):
         """Start the Security Bot Enterprise system"""
@@ -318,6 +411,7 @@ class SecurityBotEnterprise:
         
         self.logger.info("Starting Security Bot Enterprise...")
         self.running = True
+        self._stop_event.clear()
         
         try:
             # Start all component threads
@@ -339,48 +433,81 @@ class SecurityBotEnterprise:
             self.stop()
     
     def start_health_monitoring(self):
-        """Start system health monitoring"""
+        """Start system health monitoring
+        
+        Components with set_health_listener report their own state changes;
+        only those with just a health_check method are polled every minute.
+        """
+        # A fresh queue per run, so a sentinel left by an earlier stop() cannot
+        # end this monitor
+        health_queue = self._health_queue = queue.Queue()
+        polled = []
+        for name, component in self.components.items():
+            if hasattr(component, 'set_health_listener'):
+                component.set_health_listener(functools.partial(self.report_health, name))
+            elif hasattr(component, 'health_check'):
+                polled.append(name)
+        
         def health_monitor():
-            while self.running:
+            next_poll = time.monotonic()
+            while True:
                 try:
-                    # Monitor component health
-                    health_status = self.get_system_health()
-                    
-                    # Log health status
-                    if all(health_status.values()):
-                        self.logger.debug("All components healthy")
-                    else:
-                        unhealthy = [k for k, v in health_status.items() if not v]
-                        self.logger.warning("Unhealthy components: %s", unhealthy)
+                    if polled and time.monotonic() >= next_poll:
+                        next_poll += HEALTH_POLL_INTERVAL
+                        for name in polled:
+                            self._record_health(name, self._check_health(name))
                     
-                    # Sleep for health check interval
-                    time.sleep(60)  # Check every minute
+                    timeout = max(next_poll - time.monotonic(), 0) if polled else None
+                    try:
+                        report = health_queue.get(timeout=timeout)
+                    except queue.Empty:
+                        continue
+                    if report is None:
+                        break
+                    self._record_health(*report)
                     
                 except Exception as e:
                     self.logger.error("Health monitoring error: %s", e)
-                    time.sleep(60)
         
-        health_thread = threading.Thread(target=health_monitor, daemon=True)
+        health_thread = threading.Thread(target=health_monitor, daemon=True, name="sb-health")
         health_thread.start()
         self.threads.append(health_thread)
         self.logger.info("Health monitoring started")
     
+    def report_health(self, name, healthy):
+        """Health listener callback: queue a component's state change"""
+        self._health_queue.put((name, bool(healthy)))
+    
+    def _record_health(self, name, healthy):
+        """Store a component's health and log failures and recoveries"""
+        previous = self._health.get(name, True)
+        self._health[name] = healthy
+        if not healthy:
+            self.logger.warning("Unhealthy component: %s", name)
+        elif not previous:
+            self.logger.info("Component recovered: %s", name)
+    
+    def _check_health(self, name):
+        """Run a component's health_check, treating errors as unhealthy"""
+        try:
+            return bool(self.components[name].health_check())
+        except Exception as e:
+            self.logger.error("Health check failed for %s: %s", name, e)
+            return False
+    
     def get_system_health(self):
         """Get health status of all components"""
         health_status = {}
         
         for component_name, component in self.components.items():
-            try:
-                # Check if component has health check method
-                if hasattr(component, 'health_check'):
-                    health_status[component_name] = component.health_check()
-                else:
-                    # Assume healthy if no health check method
-                    health_status[component_name] = True
-                    
-            except Exception as e:
-                self.logger.error("Health check failed for %s: %s", component_name, e)
-                health_status[component_name] = False
+            if hasattr(component, 'set_health_listener'):
+                # Last state the component reported
+                health_status[component_name] = self._health.get(component_name, True)
+            elif hasattr(component, 'health_check'):
+                health_status[component_name] = self._check_health(component_name)
+            else:
+                # Assume healthy if no health check method
+                health_status[component_name] = True
         
         return health_status
     
@@ -427,13 +554,11 @@ class SecurityBotEnterprise:
         print("="*80 + "\n")
     
     def main_loop(self):
-        """Main application loop"""
+        """Main application loop: sleep until stop() is called"""
         try:
-            while self.running:
-                time.sleep(1)
+            while not self._stop_event.wait(MAIN_LOOP_WAIT):
+                pass
                 
-        except KeyboardInterrupt:
-            self.logger.info("Keyboard interrupt received")
         except Exception as e:
             self.logger.error("Main loop error: %s", e)
         finally:
@@ -446,6 +571,9 @@ class SecurityBotEnterprise:
         
         self.logger.info("Stopping Security Bot Enterprise...")
         self.running = False
+        self._stop_event.set()
+        if self._health_queue is not None:
+            self._health_queue.put(None)
         
         # Stop all components
         for component_name, component in self.components.items():
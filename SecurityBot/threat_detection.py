@@ -27,6 +27,10 @@ class ThreatDetectionEngine:
     def __init__(self, db_path="security_bot.db"):
         self.db_path = db_path
         self.monitoring = False
+        # Called with False/True when a monitor starts failing or all recover
+        self._health_listener = None
+        self._failing_monitors = set()
+        self._health_lock = threading.Lock()
         self.setup_logging()
         self.setup_database()
         
@@ -104,6 +108,27 @@ class ThreatDetectionEngine:
         self.monitoring = False
         self.logger.info("Stopping threat detection monitoring...")
     
+    def set_health_listener(self, listener):
+        """Register a callback for monitor failures and recoveries"""
+        self._health_listener = listener
+    
+    def set_monitor_health(self, monitor, healthy):
+        """Record whether a monitor's last pass succeeded
+        
+        The engine is unhealthy while any monitor is failing; the listener
+        only hears about the engine changing state.
+        """
+        with self._health_lock:
+            was_healthy = not self._failing_monitors
+            if healthy:
+                self._failing_monitors.discard(monitor)
+            else:
+                self._failing_monitors.add(monitor)
+            is_healthy = not self._failing_monitors
+            listener = self._health_listener
+        if listener and is_healthy != was_healthy:
+            listener(is_healthy)
+    
     def log_threat(self, threat_type: str, severity: str, **kwargs):
         """Log detected threat to database"""
         try:
@@ -155,10 +180,12 @@ class NetworkMonitor:
             try:
                 self.analyze_network_connections()
                 self.check_suspicious_activity()
+                self.engine.set_monitor_health('network', True)
                 time.sleep(5)  # Check every 5 seconds
                 
             except Exception as e:
                 self.logger.error("Network monitoring error: %s", e)
+                self.engine.set_monitor_health('network', False)
                 time.sleep(10)
     
     def analyze_network_connections(self):
@@ -260,10 +287,12 @@ class FileIntegrityMonitor:
         while self.engine.monitoring:
             try:
                 self.check_file_changes()
+                self.engine.set_monitor_health('file', True)
                 time.sleep(30)  # Check every 30 seconds
                 
             except Exception as e:
                 self.logger.error("File monitoring error: %s", e)
+                self.engine.set_monitor_health('file', False)
                 time.sleep(30)
     
     def scan_directories(self):
@@ -347,10 +376,12 @@ class ProcessAnalyzer:
         while self.engine.monitoring:
             try:
                 self.analyze_processes()
+                self.engine.set_monitor_health('process', True)
                 time.sleep(10)  # Check every 10 seconds
                 
             except Exception as e:
                 self.logger.error("Process monitoring error: %s", e)
+                self.engine.set_monitor_health('process', False)
                 time.sleep(10)
     
     def analyze_processes(self):
@@ -434,10 +465,12 @@ class RegistryMonitor:
         while self.engine.monitoring:
             try:
                 self.check_registry_changes()
+                self.engine.set_monitor_health('registry', True)
                 time.sleep(60)  # Check every minute
                 
             except Exception as e:
                 self.logger.error("Registry monitoring error: %s", e)
+                self.engine.set_monitor_health('registry', False)
                 time.sleep(60)
     
     def check_registry_changes(self):
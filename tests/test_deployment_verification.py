@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SecurityBot"))
+
+import deployment_verification  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_database():
+    # The database-backed checks share one scratch DatabaseIntegration per process
+    yield deployment_verification.shared_database()
+    deployment_verification.release_shared_database()
+
+
+@pytest.mark.parametrize(
+    "test_func",
+    [test_func for _, test_func in deployment_verification.VERIFICATION_TESTS],
+    ids=[test_name for test_name, _ in deployment_verification.VERIFICATION_TESTS],
+)
+def test_deployment_component(test_func):
+    # Each check uses its own unique scratch paths, so pytest-xdist workers
+    # (`pytest -n auto`) can run them side by side
+    assert test_func()
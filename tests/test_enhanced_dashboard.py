@@ -0,0 +1,42 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SecurityBot"))
+
+from enhanced_dashboard import ROLLUP_COUNTS_SQL, WINDOW_COUNTS_SQL, EnhancedDashboard  # noqa: E402
+
+
+def test_rollup_counts_match_window_scan(tmp_path):
+    db_path = str(tmp_path / "threats.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE threats (id INTEGER PRIMARY KEY, threat_type TEXT, severity TEXT, "
+                 "description TEXT, detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.executemany(
+        "INSERT INTO threats (severity, detected_at) VALUES (?, ?)",
+        [
+            ('high', '2026-01-01 09:59:59'),  # before the window
+            ('high', '2026-01-01 10:15:00'),  # oldest hour, before the cutoff
+            ('high', '2026-01-01 10:30:00'),  # oldest hour, on the cutoff
+            ('low', '2026-01-01 10:45:00'),   # oldest hour, after the cutoff
+            ('low', '2026-01-01 11:00:00'),
+            ('high', '2026-01-02 10:05:00'),  # current hour, same hour of day
+        ],
+    )
+    conn.commit()
+    conn.close()
+    
+    dashboard = EnhancedDashboard(port=0, db_path=db_path)
+    dashboard._init_db()
+    assert dashboard._rollup_ready
+    
+    cutoff = '2026-01-01 10:30:00'
+    conn = sqlite3.connect(db_path)
+    try:
+        rollup = sorted(conn.execute(ROLLUP_COUNTS_SQL, {'cutoff': cutoff}).fetchall())
+        window = sorted(conn.execute(WINDOW_COUNTS_SQL, (cutoff,)).fetchall())
+    finally:
+        conn.close()
+    
+    assert rollup == window
+    assert rollup == [('high', '10', 2, 2, 4), ('low', '10', 1, 2, 4), ('low', '11', 1, 2, 4)]
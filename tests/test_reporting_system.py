@@ -0,0 +1,46 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SecurityBot"))
+
+from reporting_system import (  # noqa: E402
+    METRICS_HOURLY_SCAN_SQL, METRICS_HOURLY_SQL, METRICS_ROLLUP_REFRESH_SQL, ReportingSystem
+)
+
+
+@pytest.mark.parametrize("sep", [" ", "T"])
+def test_metrics_rollup_matches_scan_from_mid_hour(tmp_path, sep):
+    db_path = str(tmp_path / "metrics.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE system_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "cpu_usage REAL, memory_usage REAL, disk_usage REAL, recorded_at TIMESTAMP)")
+    conn.executemany(
+        "INSERT INTO system_metrics (cpu_usage, memory_usage, disk_usage, recorded_at) "
+        "VALUES (?, ?, ?, ?)",
+        [
+            (90.0, 90.0, 90.0, f"2026-01-01{sep}10:10:00"),  # first hour, before the start
+            (10.0, 20.0, 30.0, f"2026-01-01{sep}10:40:00"),
+            (30.0, 40.0, 50.0, f"2026-01-01{sep}10:50:00"),
+            (50.0, 60.0, 70.0, f"2026-01-01{sep}11:05:00"),
+            (70.0, 80.0, 90.0, f"2026-01-01{sep}11:55:00"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    
+    reporting = ReportingSystem(db_path=db_path, output_dir=str(tmp_path / "reports"))
+    try:
+        reporting._execute_script(METRICS_ROLLUP_REFRESH_SQL)
+        window = (f"2026-01-01{sep}10:30:00", f"2026-01-01{sep}12:00:00")
+        rollup = reporting._conn.execute(METRICS_HOURLY_SQL, window).fetchall()
+        scan = reporting._conn.execute(METRICS_HOURLY_SCAN_SQL, window).fetchall()
+    finally:
+        reporting.close()
+    
+    assert [row[0] for row in rollup] == [row[0] for row in scan] == ['10', '11']
+    for rollup_row, scan_row in zip(rollup, scan):
+        assert rollup_row[1:] == pytest.approx(scan_row[1:])
+    assert rollup[0][1:] == pytest.approx((20.0, 30.0, 40.0))
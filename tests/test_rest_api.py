@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SecurityBot"))
+
+import rest_api  # noqa: E402
+from database_integration import DatabaseIntegration  # noqa: E402
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+class AllowAllAuth:
+    """Accepts the test token with every permission"""
+
+    def verify_token(self, token):
+        return {"success": token == "test-token", "message": "Invalid token",
+                "username": "tester", "role": "admin", "exp": 2 ** 40}
+
+    def check_permission(self, role, permission):
+        return True
+
+
+@pytest.fixture
+def api(tmp_path):
+    db = DatabaseIntegration(str(tmp_path / "api.db"))
+    for i in range(10):
+        db.log_threat({"threat_id": f"threat_{i:02d}", "threat_type": "port_scan",
+                       "severity": "high", "description": f"Threat {i}"})
+    # A third of the threats have no timestamp
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE threats SET detected_at = NULL WHERE id % 3 = 0")
+    conn.commit()
+    conn.close()
+
+    return rest_api.SecurityBotAPI(AllowAllAuth(), db, None, None)
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+def test_cursor_pages_include_threats_without_timestamps(client):
+    first = json.loads(client.get("/threats?limit=4", headers=HEADERS).data)
+    total = first["pagination"]["total"]
+    seen = [threat["threat_id"] for threat in first["threats"]]
+    cursor = first["pagination"]["next_cursor"]
+    while cursor:
+        page = json.loads(client.get("/threats", query_string={"limit": 4, "after": cursor},
+                                     headers=HEADERS).data)
+        seen += [threat["threat_id"] for threat in page["threats"]]
+        cursor = page["pagination"]["next_cursor"]
+
+    assert total == 10
+    assert sorted(seen) == [f"threat_{i:02d}" for i in range(10)]
+
+
+def test_cursor_and_page_walks_match(client):
+    by_page = json.loads(client.get("/threats?limit=10", headers=HEADERS).data)["threats"]
+    # Threats without a timestamp come last
+    assert [threat["detected_at"] is None for threat in by_page] == [False] * 7 + [True] * 3
+
+    by_cursor = json.loads(client.get("/threats?limit=5", headers=HEADERS).data)
+    cursor = by_cursor["pagination"]["next_cursor"]
+    second = json.loads(client.get("/threats", query_string={"limit": 5, "after": cursor},
+                                   headers=HEADERS).data)
+    walked = by_cursor["threats"] + second["threats"]
+    assert [t["threat_id"] for t in walked] == [t["threat_id"] for t in by_page]
+
+
+def test_closed_export_returns_its_reader(api, client):
+    response = client.get("/export/threats", headers=HEADERS, buffered=False)
+    assert next(response.iter_encoded()).startswith(b"id,")
+    assert api.db_pool._readers.qsize() == 0
+
+    # A client that goes away mid-export closes the response
+    response.close()
+
+    assert api.db_pool._readers.qsize() == 1
@@ -0,0 +1,144 @@
+import json
+import os
+import pickle
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SecurityBot"))
+
+import security_bot_main  # noqa: E402
+from enhanced_dashboard import EnhancedDashboard  # noqa: E402
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    # Logs and the saved configuration land in the scratch directory; the
+    # components under test are attached by hand
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(security_bot_main.SecurityBotEnterprise, "initialize_components", lambda self: None)
+    monkeypatch.setattr(security_bot_main.SecurityBotEnterprise, "setup_signal_handlers", lambda self: None)
+    bot = security_bot_main.SecurityBotEnterprise()
+    # No threats table, so every dashboard query fails
+    bot.components = {"dashboard": EnhancedDashboard(port=0, db_path=str(tmp_path / "empty.db"))}
+    yield bot
+    bot.stop()
+
+
+def wait_for_health(bot, name, healthy, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if bot.get_system_health()[name] == healthy:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_reported_failure_reaches_system_health(bot):
+    bot.running = True
+    bot.start_health_monitoring()
+    assert bot.get_system_health() == {"dashboard": True}
+
+    bot.components["dashboard"]._query_dashboard_data()
+    assert wait_for_health(bot, "dashboard", False)
+
+
+def test_health_monitoring_survives_restart(bot):
+    bot.running = True
+    bot.start_health_monitoring()
+    bot.stop()
+    # Stopped again before the monitor was restarted
+    bot.running = True
+    bot.stop()
+
+    # No sentinel from either stop() may end the next monitor run
+    bot.running = True
+    bot.start_health_monitoring()
+    bot.components["dashboard"]._query_dashboard_data()
+    assert wait_for_health(bot, "dashboard", False)
+
+
+def test_deep_merge_recurses_into_nested_sections():
+    base = {"a": {"x": 1, "y": {"p": 1, "q": 2}}, "b": [1, 2], "c": 3}
+    overlay = {"a": {"y": {"q": 20, "r": 30}}, "b": [3], "d": {"z": 1}}
+
+    merged = security_bot_main.SecurityBotEnterprise._deep_merge(base, overlay)
+
+    assert merged is base
+    assert merged == {"a": {"x": 1, "y": {"p": 1, "q": 20, "r": 30}}, "b": [3], "c": 3, "d": {"z": 1}}
+
+
+def test_deep_merge_replaces_dict_with_scalar_and_back():
+    base = {"a": {"x": 1}, "b": 2}
+    merged = security_bot_main.SecurityBotEnterprise._deep_merge(base, {"a": None, "b": {"y": 1}})
+    assert merged == {"a": None, "b": {"y": 1}}
+
+
+def write_config(bot, config):
+    with open(bot.config_file, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+
+def tamper_cache(bot, config):
+    # Keep the cache key, so a cache hit returns this config instead of the file's
+    cache_file = bot.config_file + security_bot_main.CONFIG_CACHE_SUFFIX
+    with open(cache_file, "rb") as f:
+        cached = pickle.load(f)
+    cached["config"] = config
+    with open(cache_file, "wb") as f:
+        pickle.dump(cached, f)
+    return cache_file
+
+
+posix_only = pytest.mark.skipif(not security_bot_main.CONFIG_CACHE_ENABLED,
+                                reason="configuration cache is POSIX only")
+
+
+@posix_only
+def test_configuration_cache_miss_writes_private_cache(bot):
+    write_config(bot, {"logging": {"level": "DEBUG"}})
+
+    assert bot.read_saved_configuration() == {"logging": {"level": "DEBUG"}}
+
+    cache_file = Path(bot.config_file + security_bot_main.CONFIG_CACHE_SUFFIX)
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+
+@posix_only
+def test_configuration_cache_hit_skips_parsing(bot):
+    write_config(bot, {"logging": {"level": "DEBUG"}})
+    bot.read_saved_configuration()
+    tamper_cache(bot, {"from": "cache"})
+
+    assert bot.read_saved_configuration() == {"from": "cache"}
+
+
+@posix_only
+def test_configuration_cache_invalidated_by_edit(bot):
+    write_config(bot, {"logging": {"level": "DEBUG"}})
+    bot.read_saved_configuration()
+    tamper_cache(bot, {"from": "cache"})
+
+    write_config(bot, {"logging": {"level": "WARNING"}})
+
+    assert bot.read_saved_configuration() == {"logging": {"level": "WARNING"}}
+
+
+@posix_only
+def test_configuration_cache_writable_by_others_is_ignored(bot):
+    write_config(bot, {"logging": {"level": "DEBUG"}})
+    bot.read_saved_configuration()
+    cache_file = tamper_cache(bot, {"from": "cache"})
+    os.chmod(cache_file, 0o666)
+
+    assert bot.read_saved_configuration() == {"logging": {"level": "DEBUG"}}
+
+
+@pytest.mark.parametrize("name, method_name, label", security_bot_main.COMPONENT_RUNNERS)
+def test_component_runner_methods_exist(name, method_name, label):
+    spec = next(spec for spec in security_bot_main.COMPONENT_SPECS if spec[0] == name)
+    cls = security_bot_main.component_class(spec[3], spec[4])
+    assert callable(getattr(cls, method_name, None))